@@ -0,0 +1,230 @@
+"""
+Parser throughput benchmark with a stored baseline.
+
+Every *_postprocess parser runs on its site fixture (benchmarks/fixtures/<site>.xml)
+and on large synthetic documents in its format (see benchmarks/synthetic_feeds.py).
+Reported per case: items/sec, MB/sec, peak traced memory, and memory blocks still held
+per parsed item (a proxy for allocations per item). Every case must also parse real
+content: each item needs a title and a link, and most need a description and a parsed
+pub_date. Results are compared with benchmarks/baseline.json and the process exits
+with status 1 on a content failure or a regression:
+    python -m benchmarks.bench_parsers
+    python -m benchmarks.bench_parsers --only engadget,theverge
+    python -m benchmarks.bench_parsers --save-baseline
+
+Throughput of the small site fixtures is reported but not gated. Timings are
+machine-dependent: regenerate the baseline with --save-baseline on the
+machine that runs the comparison.
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.synthetic_feeds import generate_feed
+
+# ====== Configuration ======
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+SYNTHETIC_ITEMS = 1000
+SYNTHETIC_DESCRIPTION_CHARS = 2000
+MIN_BENCH_SECONDS = 0.5     # each case is repeated for at least this long
+REPEATS = 5                 # best of REPEATS timed rounds
+SPEED_TOLERANCE = 0.30      # fail when items/sec drops more than this fraction
+MEMORY_TOLERANCE = 0.20     # fail when peak memory or blocks/item grow more than this
+SPEED_MIN_ITEMS = 100       # smaller documents (the fixtures) are too quick to time reliably
+MIN_FIELD_RATE = 0.85       # share of items that must have a description and a parsed pub_date
+
+# parser name -> ("module:function", synthetic formats it is expected to read)
+PARSERS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "arstechnica": ("feeds.arstechnica_feed:arstechnica_postprocess", ("rss",)),
+    "engadget": ("feeds.engadget_feed:engadget_postprocess", ("rss",)),
+    "geekwire": ("feeds.geekwire_feed:geekwire_postprocess", ("rss",)),
+    "haberturk": ("feeds.haberturk_feed:haberturk_postprocess", ("rss",)),
+    "techcrunch": ("feeds.techcrunch_feed:techcrunch_postprocess", ("rss",)),
+    "theverge": ("feeds.theverge_feed:theverge_postprocess", ("atom",)),
+    "wired": ("feeds.wired_feed:wired_postprocess", ("rss",)),
+}
+
+
+def _load_parser(spec: str) -> Callable:
+    module, func = spec.split(":")
+    return getattr(importlib.import_module(module), func)
+
+
+def _time_per_call(fn: Callable, raw: bytes) -> float:
+    """Best-of-REPEATS seconds per call, each round running for at least MIN_BENCH_SECONDS."""
+    start = time.perf_counter()
+    fn(raw, "bench")
+    number = max(1, int(MIN_BENCH_SECONDS / max(time.perf_counter() - start, 1e-6)))
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(raw, "bench")
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _memory(fn: Callable, raw: bytes) -> Tuple[List, int, int]:
+    """(parsed items, peak traced bytes during the call, blocks held by the result)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        items = fn(raw, "bench")
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename") if s.count_diff > 0)
+    return items, peak - base, blocks
+
+
+def _field_rates(parsed: List) -> Dict[str, float]:
+    """Share of parsed items with each field filled in."""
+    n = len(parsed) or 1
+    return {
+        "title": sum(1 for it in parsed if it.title) / n,
+        "link": sum(1 for it in parsed if it.link) / n,
+        "description": sum(1 for it in parsed if it.description) / n,
+        "pub_date": sum(1 for it in parsed if it.pub_date is not None) / n,
+    }
+
+
+def run_case(fn: Callable, raw: bytes) -> Dict:
+    fn(raw, "bench")  # warm-up: module-level caches (strptime, regexes) are not per-item cost
+    parsed, peak, blocks = _memory(fn, raw)
+    items = len(parsed)
+    seconds = _time_per_call(fn, raw)
+    return {
+        "items": items,
+        "fields": _field_rates(parsed),
+        "bytes": len(raw),
+        "seconds": seconds,
+        "items_per_sec": items / seconds,
+        "mb_per_sec": len(raw) / seconds / 1e6,
+        "peak_bytes": peak,
+        "blocks_per_item": blocks / items if items else float(blocks),
+    }
+
+
+def cases(only: List[str]) -> List[Tuple[str, str, bytes]]:
+    """(case name, parser name, document) for every parser/document pair."""
+    synthetic: Dict[str, bytes] = {}
+    found = []
+    for name, (_, kinds) in sorted(PARSERS.items()):
+        if only and name not in only:
+            continue
+        with open(os.path.join(FIXTURES_DIR, f"{name}.xml"), "rb") as f:
+            found.append((f"{name}/fixture", name, f.read()))
+        for kind in kinds:
+            if kind not in synthetic:
+                synthetic[kind] = generate_feed(kind, SYNTHETIC_ITEMS, SYNTHETIC_DESCRIPTION_CHARS)
+            found.append((f"{name}/synthetic-{kind}-{SYNTHETIC_ITEMS}", name, synthetic[kind]))
+    return found
+
+
+def check_content(results: Dict[str, Dict]) -> List[str]:
+    """Messages for cases that parsed no items or items missing their content."""
+    problems = []
+    for case, r in results.items():
+        if not r["items"]:
+            problems.append(f"{case}: parsed no items")
+            continue
+        fields = r["fields"]
+        for field in ("title", "link"):
+            if fields[field] < 1.0:
+                problems.append(f"{case}: {fields[field]:.0%} of items have a {field}")
+        for field in ("description", "pub_date"):
+            if fields[field] < MIN_FIELD_RATE:
+                problems.append(f"{case}: {fields[field]:.0%} of items have a {field}, need {MIN_FIELD_RATE:.0%}")
+    return problems
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> List[str]:
+    """Regression messages for results that fall outside the tolerances."""
+    problems = []
+    for case, r in results.items():
+        b = baseline.get(case)
+        if b is None:
+            continue
+        if r["items"] != b["items"]:
+            problems.append(f"{case}: parsed {r['items']} items, baseline {b['items']}")
+        if r["items"] >= SPEED_MIN_ITEMS and r["items_per_sec"] < b["items_per_sec"] * (1 - SPEED_TOLERANCE):
+            problems.append(f"{case}: {r['items_per_sec']:.0f} items/s vs baseline {b['items_per_sec']:.0f}")
+        if r["peak_bytes"] > b["peak_bytes"] * (1 + MEMORY_TOLERANCE):
+            problems.append(f"{case}: peak {r['peak_bytes'] / 1024:.0f} KB vs baseline {b['peak_bytes'] / 1024:.0f} KB")
+        if r["blocks_per_item"] > b["blocks_per_item"] * (1 + MEMORY_TOLERANCE):
+            problems.append(f"{case}: {r['blocks_per_item']:.1f} blocks/item vs baseline {b['blocks_per_item']:.1f}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_parsers")
+    parser.add_argument("--only", default="", help="comma-separated parser names")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args()
+    only = [n for n in args.only.split(",") if n]
+    unknown = [n for n in only if n not in PARSERS]
+    if unknown:
+        raise SystemExit(f"❌ Unknown parser(s): {', '.join(unknown)}")
+
+    parsers = {name: _load_parser(spec) for name, (spec, _) in PARSERS.items()}
+    results: Dict[str, Dict] = {}
+    print(f"{'case':<36} {'items':>6} {'items/s':>10} {'MB/s':>7} {'peak KB':>9} {'blocks/item':>11}")
+    for case, name, raw in cases(only):
+        r = run_case(parsers[name], raw)
+        results[case] = r
+        print(f"{case:<36} {r['items']:>6} {r['items_per_sec']:>10.0f} {r['mb_per_sec']:>7.1f} "
+              f"{r['peak_bytes'] / 1024:>9.0f} {r['blocks_per_item']:>11.1f}")
+
+    problems = check_content(results)
+    if problems:
+        print(f"❌ {len(problems)} case(s) parsed incomplete content:")
+        for p in problems:
+            print(f"   {p}")
+        sys.exit(1)
+
+    machine = {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine()}
+    if args.save_baseline:
+        stored = {"machine": machine, "cases": {}}
+        if only and os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                stored["cases"] = json.load(f).get("cases", {})
+        stored["cases"].update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Saved {len(results)} cases to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("machine", {}).get("python") != machine["python"]:
+        print(f"⚠️ Baseline was recorded on Python {baseline.get('machine', {}).get('python')}, "
+              f"this is {machine['python']}")
+    problems = compare(results, baseline.get("cases", {}))
+    if problems:
+        print(f"❌ {len(problems)} regression(s) against {args.baseline}:")
+        for p in problems:
+            print(f"   {p}")
+        sys.exit(1)
+    print(f"✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark the shared HTML sanitizer against the per-parser cleanup it replaced.
+
+    python -m benchmarks.bench_sanitizer
+    python -m benchmarks.bench_sanitizer --sizes 2000,50000,1000000 --repeat 5
+
+The legacy pipeline is Engadget's former clean_html followed by the normalize_text
+copy the parsers used to carry. Outputs are checked for equality (untruncated) before
+timing, so the comparison is between equivalent results.
+"""
+import argparse
+import html
+import re
+import timeit
+
+from core.text_sanitizer import DESCRIPTION_MAX_CHARS, html_to_text
+
+_PARAGRAPH = (
+    "<p>Acme&#8217;s new \u201cGlobex\u201d partnership &mdash; announced&nbsp;today &amp; "
+    "covered <a href=\"https://example.com/x?a=1&amp;b=2\">here</a> \u2013 "
+    "<strong>expands</strong> the deal.<br/>\n\t More\xa0details follow.</p>\n"
+)
+_WIDGETS = (
+    "<iframe src=\"https://www.youtube.com/embed/x\" width=\"560\">fallback text</iframe>"
+    "<core-commerce data-id=\"42\"><div class=\"price\">$199</div></core-commerce>"
+)
+
+
+def legacy_clean_html(raw_html: str) -> str:
+    """Engadget's clean_html before the shared sanitizer."""
+    if not raw_html:
+        return ""
+    cleaned = re.sub(r"<iframe[^>]*>.*?</iframe>", " ", raw_html, flags=re.DOTALL | re.IGNORECASE)
+    cleaned = re.sub(r"<core-commerce[^>]*>.*?</core-commerce>", " ", cleaned, flags=re.DOTALL | re.IGNORECASE)
+    cleaned = re.sub(r"<[^>]+>", " ", cleaned)
+    cleaned = html.unescape(cleaned)
+    cleaned = re.sub(r"\s+", " ", cleaned)
+    return cleaned.strip()
+
+
+def legacy_normalize_text(text: str) -> str:
+    """The normalize_text copy carried by the Engadget/Ars/WIRED/Verge parsers."""
+    text = html.unescape(text or "")
+    text = text.strip()
+    text = text.replace("\u2013", "-").replace("\u2014", "-")
+    text = text.replace("\u2018", "'").replace("\u2019", "'")
+    text = text.replace("\u201c", '"').replace("\u201d", '"')
+    text = text.replace("\xa0", " ")
+    text = re.sub(r"\s+", " ", text)
+    return text
+
+
+def legacy(raw_html: str) -> str:
+    return legacy_normalize_text(legacy_clean_html(raw_html))
+
+
+def make_description(chars: int) -> str:
+    """HTML description of roughly `chars` characters with widgets every few paragraphs."""
+    block = _PARAGRAPH * 4 + _WIDGETS
+    return (block * (chars // len(block) + 1))[:chars].rsplit("</p>", 1)[0] + "</p>"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_sanitizer")
+    parser.add_argument("--sizes", default="2000,50000,1000000", help="description sizes in characters")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>9}  {'legacy':>10}  {'shared':>10}  {'speedup':>7}  "
+          f"{'truncated':>10}  {'speedup':>7}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        text = make_description(size)
+        expected = legacy(text)
+        if html_to_text(text) != expected:
+            raise SystemExit(f"❌ Output differs from the legacy cleanup at {size} chars")
+        if not expected.startswith(html_to_text(text, DESCRIPTION_MAX_CHARS)):
+            raise SystemExit(f"❌ Truncated output is not a prefix at {size} chars")
+
+        number = max(1, 200_000 // size)
+        old = min(timeit.repeat(lambda: legacy(text), number=number, repeat=args.repeat)) / number
+        new = min(timeit.repeat(lambda: html_to_text(text), number=number, repeat=args.repeat)) / number
+        cut = min(timeit.repeat(
+            lambda: html_to_text(text, DESCRIPTION_MAX_CHARS), number=number, repeat=args.repeat
+        )) / number
+        print(f"{size:>9}  {old * 1e3:>8.3f}ms  {new * 1e3:>8.3f}ms  {old / new:>6.1f}x  "
+              f"{cut * 1e3:>8.3f}ms  {old / cut:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Large synthetic RSS 2.0, Atom and RSS 1.0 (RDF) documents for parser benchmarks.
+
+Items carry the namespaces real feeds use (dc, media, content), HTML descriptions in
+CDATA with entities, iframes and commerce widgets, and every MALFORMED_DATE_EVERY-th
+item gets a broken or oddly formatted date. Output is deterministic for a given seed:
+    python -m benchmarks.synthetic_feeds rss --items 5000 > /tmp/big_rss.xml
+    python -m benchmarks.synthetic_feeds atom --items 1000 --description-chars 8000 > /tmp/big_atom.xml
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from xml.sax.saxutils import escape
+
+# ====== Configuration ======
+DEFAULT_ITEMS = 1000
+DEFAULT_DESCRIPTION_CHARS = 2000
+MALFORMED_DATE_EVERY = 10
+
+KINDS = ("rss", "atom", "rdf")
+
+_WORDS = (
+    "acme globex initech partnership agreement acquisition startup funding round chip "
+    "cloud model launch regulators deal market investors quarter revenue device update "
+    "savunma ekonomi ihracat sözleşme bakanlık anlaşma yatırım şirket"
+).split()
+_MALFORMED_DATES = (
+    "",
+    "yesterday",
+    "Fri, 31 Oct 2025 25:61:00 +0000",
+    "31/10/2025 12:00",
+    "2025-13-45T00:00:00Z",
+    "Fri, 31 Oct 2025 12:00:00 +03:00",
+    "2025-10-31T12:00:00Z",
+)
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(8, 18))
+    return " ".join(words).capitalize()
+
+
+def _html_description(rng: random.Random, chars: int) -> str:
+    parts, size = [], 0
+    while size < chars:
+        roll = rng.random()
+        if roll < 0.08:
+            part = '<iframe src="https://www.youtube.com/embed/x" width="560">video</iframe>'
+        elif roll < 0.14:
+            part = '<core-commerce slot="commerce"><div class="price">$199 at Amazon</div></core-commerce>'
+        elif roll < 0.20:
+            part = '<img src="https://cdn.example.com/i.jpg" alt="" /><br />'
+        else:
+            part = (f"<p>{_sentence(rng)} &#8217;{rng.choice(_WORDS)}&#8217; &mdash; "
+                    f"<a href=\"https://example.com/?a=1&amp;b=2\">{rng.choice(_WORDS)}</a>&nbsp;"
+                    f"\u201c{_sentence(rng)}\u201d.</p>")
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def _dates(rng: random.Random, i: int, start: datetime):
+    """(datetime, malformed string or None) for item i."""
+    when = start - timedelta(minutes=7 * i + rng.randint(0, 6))
+    if i % MALFORMED_DATE_EVERY == MALFORMED_DATE_EVERY - 1:
+        return when, rng.choice(_MALFORMED_DATES)
+    return when, None
+
+
+def _rss(rng, items, chars, start) -> str:
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:media="http://search.yahoo.com/mrss/" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/">\n<channel>\n'
+        "<title>Synthetic RSS</title><link>https://example.com/</link>"
+        "<description>Synthetic benchmark feed</description>\n"
+    ]
+    for i in range(items):
+        when, bad = _dates(rng, i, start)
+        pub = bad if bad is not None else when.strftime("%a, %d %b %Y %H:%M:%S +0000")
+        out.append(
+            f"<item><title>{escape(_sentence(rng))} &amp; more {i}</title>"
+            f"<link>https://example.com/story/{i}</link>"
+            f'<guid isPermaLink="false">synthetic-{i}</guid>'
+            f"<dc:creator><![CDATA[Author {i % 17}]]></dc:creator>"
+            f"<pubDate>{pub}</pubDate>"
+            f"<description><![CDATA[{_html_description(rng, chars)}]]></description>"
+            f'<media:content url="https://cdn.example.com/{i}.jpg" medium="image"/>'
+            f"<category><![CDATA[{rng.choice(_WORDS)}]]></category></item>\n"
+        )
+    out.append("</channel>\n</rss>\n")
+    return "".join(out)
+
+
+def _atom(rng, items, chars, start) -> str:
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="en-US">\n'
+        '<title type="html">Synthetic Atom</title><id>https://example.com/atom</id>'
+        f"<updated>{start.isoformat()}</updated>\n"
+    ]
+    for i in range(items):
+        when, bad = _dates(rng, i, start)
+        published = bad if bad is not None else when.astimezone(timezone(timedelta(hours=-4))).isoformat()
+        out.append(
+            f"<entry><author><name>Author {i % 17}</name></author>"
+            f'<title type="html"><![CDATA[{_sentence(rng)} \u2014 {i}]]></title>'
+            f'<link rel="alternate" type="text/html" href="https://example.com/entry/{i}"/>'
+            f"<id>https://example.com/?p={i}</id>"
+            f"<updated>{when.isoformat()}</updated><published>{published}</published>"
+            f'<summary type="html"><![CDATA[{_html_description(rng, chars)}]]></summary></entry>\n'
+        )
+    out.append("</feed>\n")
+    return "".join(out)
+
+
+def _rdf(rng, items, chars, start) -> str:
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+        'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+        '<channel rdf:about="https://example.com/rdf"><title>Synthetic RDF</title>'
+        "<link>https://example.com/</link><description>Synthetic benchmark feed</description>"
+        "</channel>\n"
+    ]
+    for i in range(items):
+        when, bad = _dates(rng, i, start)
+        date = bad if bad is not None else when.isoformat()
+        out.append(
+            f'<item rdf:about="https://example.com/rdf/{i}">'
+            f"<title>{escape(_sentence(rng))} {i}</title>"
+            f"<link>https://example.com/rdf/{i}</link>"
+            f"<description>{escape(_html_description(rng, chars))}</description>"
+            f"<dc:date>{date}</dc:date><dc:creator>Author {i % 17}</dc:creator></item>\n"
+        )
+    out.append("</rdf:RDF>\n")
+    return "".join(out)
+
+
+def generate_feed(
+    kind: str,
+    items: int = DEFAULT_ITEMS,
+    description_chars: int = DEFAULT_DESCRIPTION_CHARS,
+    seed: int = 0,
+) -> bytes:
+    """UTF-8 bytes of a synthetic `kind` ("rss", "atom" or "rdf") document."""
+    builders = {"rss": _rss, "atom": _atom, "rdf": _rdf}
+    if kind not in builders:
+        raise ValueError(f"Unknown feed kind: {kind} (expected one of {', '.join(KINDS)})")
+    start = datetime(2025, 10, 31, 18, 0, tzinfo=timezone.utc)
+    return builders[kind](random.Random(seed), items, description_chars, start).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic_feeds")
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS)
+    parser.add_argument("--description-chars", type=int, default=DEFAULT_DESCRIPTION_CHARS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.stdout.buffer.write(generate_feed(args.kind, args.items, args.description_chars, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,183 @@
-from feeds.haberturk_feed import haberturk_postprocess
-from feeds.techcrunch_feed import techcrunch_postprocess
-from feeds.wired_feed import wired_postprocess
-from feeds.arstechnica_feed import arstechnica_postprocess
-from feeds.geekwire_feed import geekwire_postprocess
-from feeds.theverge_feed import theverge_postprocess
-from feeds.engadget_feed import engadget_postprocess
-
-FEEDS = [
-    {
-        "name": "Haberturk",
-        "urls": [
-            "https://www.haberturk.com/rss/manset.xml",
-            "https://www.haberturk.com/rss/ekonomi.xml",
-        ],
-        "postprocess_fn": haberturk_postprocess,
-        "llm_prompt": (
-            "Determine if this Turkish news article concerns an improvement or advancement in Turkey’s military capabilities — such as the introduction of new weapons, technologies like aircraft, drones, or defense systems. Focus only on concrete, measurable military developments, not political statements or rhetoric."
-            "Score from 1–10, where 10 is highly related to AI."
-        ),
-    },
-    {
-        "name": "Tech Crunch",
-        "urls": ["https://techcrunch.com/feed/"],
-        "postprocess_fn": techcrunch_postprocess,
-        "llm_prompt": (
-            "Assess how strongly this article discusses a partnership, collaboration, or any type of relationship —positive or negative— between multiple companies."
-            "Score 0–10 with a brief reasoning."
-        ),
-    },
-    {
-        "name": "Wired",
-        "urls": [
-            "https://www.wired.com/feed/category/business/latest/rss",
-            "https://www.wired.com/feed/tag/ai/latest/rss",
-        ],
-        "postprocess_fn": wired_postprocess,
-        "llm_prompt": (
-            "Assess how strongly this article discusses a partnership, collaboration, or any type of relationship —positive or negative— between multiple companies."
-            "Give a score (0–10) and short reasoning."
-        ),
-    },
-    {
-        "name": "Ars Technica",
-        "urls": ["https://feeds.arstechnica.com/arstechnica/index"],
-        "postprocess_fn": arstechnica_postprocess,
-        "llm_prompt": (
-            "Assess how strongly this article discusses a partnership, collaboration, or any type of relationship —positive or negative— between multiple companies."
-            "Score 0–10 with reasoning."
-        ),
-    },
-    {
-        "name": "GeekWire",
-        "urls": ["https://www.geekwire.com/feed/"],
-        "postprocess_fn": geekwire_postprocess,
-        "llm_prompt": (
-            "Assess how strongly this article discusses a partnership, collaboration, or any type of relationship —positive or negative— between multiple companies."
-            "Give a 0–10 relevance score."
-        ),
-    },
-
-    {
-        "name": "The Verge",
-        "urls": ["https://www.theverge.com/rss/index.xml"],
-        "postprocess_fn": theverge_postprocess,
-        "llm_prompt": (
-            "Assess how strongly this article discusses a partnership, collaboration, or any type of relationship —positive or negative— between multiple companies."
-            "Score 0–10 with concise reasoning."
-        ),
-    },
-
-    {
-        "name": "Engadget",
-        "urls": ["https://www.engadget.com/rss.xml"],
-        "postprocess_fn": engadget_postprocess,
-        "llm_prompt": (
-            "Assess how strongly this article discusses a partnership, collaboration, or any type of relationship —positive or negative— between multiple companies."
-            "Score 0–10 with concise reasoning."
-        ),
-    },
-]
+import importlib
+import os
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+REGISTRY_PATH = os.getenv(
+    "FEEDS_REGISTRY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "feeds.yaml")
+)
+
+_FEED_KEYS = {
+    "name", "urls", "parser", "topic", "topics", "enabled", "schedule",
+    "rescore_band", "model_tiers", "escalation_band", "min_confidence",
+}
+
+
+class FeedRegistryError(ValueError):
+    """Raised when the feed registry fails validation."""
+
+
+class LazyParser:
+    """Callable stand-in for a "module:function" parser, imported on first call."""
+
+    __slots__ = ("spec", "_fn")
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        self._fn: Optional[Callable] = None
+
+    def __call__(self, raw_bytes, *args, **kwargs):
+        if self._fn is None:
+            module_name, fn_name = self.spec.split(":")
+            self._fn = getattr(importlib.import_module(module_name), fn_name)
+        return self._fn(raw_bytes, *args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyParser({self.spec!r})"
+
+
+def _band(value, where: str, errors: List[str], required: bool = False):
+    if value is None:
+        if required:
+            errors.append(f"{where}: required")
+        return None
+    if not (
+        isinstance(value, (list, tuple)) and len(value) == 2
+        and all(isinstance(v, int) and not isinstance(v, bool) for v in value) and value[0] <= value[1]
+    ):
+        errors.append(f"{where}: expected [low, high] integers with low <= high, got {value!r}")
+        return None
+    return tuple(value)
+
+
+def _validate_cascade(settings: Dict, where: str, errors: List[str]) -> None:
+    """Check the required escalation settings in place, storing the band as a tuple."""
+    settings["escalation_band"] = _band(settings.get("escalation_band"), f"{where} escalation_band", errors, True)
+    confidence = settings.get("min_confidence")
+    if not isinstance(confidence, int) or isinstance(confidence, bool):
+        errors.append(f"{where}: min_confidence must be an integer, got {confidence!r}")
+
+
+def _validate_tiers(tiers, where: str, errors: List[str]) -> None:
+    if not isinstance(tiers, list) or not tiers:
+        errors.append(f"{where}: model_tiers must be a non-empty list")
+        return
+    for tier in tiers:
+        if not isinstance(tier, dict) or not tier.get("name") or not tier.get("model"):
+            errors.append(f"{where}: every model tier needs a name and a model, got {tier!r}")
+
+
+def load_registry(path: str = REGISTRY_PATH) -> Dict:
+    """
+    Load and validate the feed registry (YAML, or JSON which YAML also reads).
+    Returns {"topics": ..., "defaults": ..., "feeds": [feed dicts]} where each feed has
+    its defaults applied, a LazyParser as postprocess_fn, its topic keys in `topics`
+    and their prompt/threshold/recipients in `subscriptions`. `topic` and `llm_prompt`
+    hold the first subscribed topic. All problems are reported together in one
+    FeedRegistryError.
+    """
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=loader) or {}
+
+    errors: List[str] = []
+    topics = data.get("topics") or {}
+    defaults = data.get("defaults") or {}
+    _validate_tiers(defaults.get("model_tiers"), "defaults", errors)
+    _validate_cascade(defaults, "defaults", errors)
+    for key, topic in topics.items():
+        if not isinstance(topic, dict) or not isinstance(topic.get("prompt"), str):
+            errors.append(f"topic {key!r}: a prompt string is required")
+            continue
+        if not isinstance(key, str) or not key.isidentifier():
+            errors.append(f"topic {key!r}: keys must be identifiers (they name JSON fields)")
+        if topic.get("threshold") is not None and not isinstance(topic["threshold"], int):
+            errors.append(f"topic {key!r}: threshold must be an integer")
+        recipients = topic.get("recipients")
+        if recipients is not None and not (
+            isinstance(recipients, list) and all(isinstance(r, str) and r for r in recipients)
+        ):
+            errors.append(f"topic {key!r}: recipients must be a list of email addresses")
+
+    feeds: List[Dict] = []
+    seen = set()
+    for i, entry in enumerate(data.get("feeds") or []):
+        where = f"feed #{i + 1} ({entry.get('name', '?') if isinstance(entry, dict) else entry!r})"
+        if not isinstance(entry, dict):
+            errors.append(f"{where}: expected a mapping")
+            continue
+
+        unknown = set(entry) - _FEED_KEYS
+        if unknown:
+            errors.append(f"{where}: unknown keys {sorted(unknown)}")
+
+        name = entry.get("name")
+        if not isinstance(name, str) or not name:
+            errors.append(f"{where}: name is required")
+        elif name in seen:
+            errors.append(f"{where}: duplicate name")
+        seen.add(name)
+
+        urls = entry.get("urls")
+        if not isinstance(urls, list) or not urls or not all(isinstance(u, str) and u for u in urls):
+            errors.append(f"{where}: urls must be a non-empty list of strings")
+
+        parser = entry.get("parser")
+        if not isinstance(parser, str) or parser.count(":") != 1:
+            errors.append(f"{where}: parser must look like 'module:function'")
+
+        if ("topic" in entry) == ("topics" in entry):
+            errors.append(f"{where}: exactly one of topic or topics is required")
+        subscribed = entry["topics"] if "topics" in entry else [entry.get("topic")]
+        if not isinstance(subscribed, list) or not subscribed:
+            errors.append(f"{where}: topics must be a non-empty list")
+            subscribed = []
+        elif len(set(map(str, subscribed))) != len(subscribed):
+            errors.append(f"{where}: duplicate topics {subscribed}")
+        for topic in subscribed:
+            if topic not in topics:
+                errors.append(f"{where}: unknown topic {topic!r}")
+
+        feed = {**defaults, **entry}
+        feed["schedule"] = {**(defaults.get("schedule") or {}), **(entry.get("schedule") or {})}
+        _validate_tiers(feed.get("model_tiers"), where, errors)
+        if "escalation_band" in entry or "min_confidence" in entry:
+            _validate_cascade(feed, where, errors)  # otherwise inherited from the checked defaults
+        feed["rescore_band"] = _band(feed.get("rescore_band"), f"{where} rescore_band", errors)
+        if isinstance(parser, str):
+            feed["postprocess_fn"] = LazyParser(parser)
+        known = [t for t in subscribed if t in topics and isinstance(topics[t], dict)]
+        if known:
+            feed["topics"] = known
+            feed["topic"] = known[0]
+            feed["llm_prompt"] = topics[known[0]].get("prompt")
+            feed["subscriptions"] = {
+                t: {
+                    "prompt": topics[t].get("prompt"),
+                    "threshold": topics[t].get("threshold"),
+                    "recipients": topics[t].get("recipients"),
+                }
+                for t in known
+            }
+        feeds.append(feed)
+
+    if errors:
+        raise FeedRegistryError(f"Invalid feed registry {path}:\n  " + "\n  ".join(errors))
+    return {"topics": topics, "defaults": defaults, "feeds": feeds}
+
+
+REGISTRY = load_registry()
+
+# Every registered feed, and the ones enabled for scheduled runs
+ALL_FEEDS = REGISTRY["feeds"]
+FEEDS = [feed for feed in ALL_FEEDS if feed.get("enabled", True)]
+
+DEFAULT_MODEL_TIERS = REGISTRY["defaults"]["model_tiers"]
+DEFAULT_ESCALATION_BAND = tuple(REGISTRY["defaults"]["escalation_band"])
+DEFAULT_MIN_CONFIDENCE = REGISTRY["defaults"]["min_confidence"]
+
+
+def get_feed(name: str) -> Optional[Dict]:
+    """Look up a registered feed (enabled or not) by name."""
+    return next((feed for feed in ALL_FEEDS if feed["name"] == name), None)
@@ -0,0 +1,145 @@
+"""
+Streaming alert delivery.
+
+Relevant items are emailed while the run is still going: the first relevant item of
+a feed/topic opens a short window, and everything that crosses the threshold within
+it goes out in one email (sooner if the batch fills up). Feeds flush their open
+windows when they finish, so nothing waits for the end of the run. Alerts for
+clustered stories are held until every feed has been parsed (see settle()), so other
+outlets' copies of the story are listed under the one alert.
+"""
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from core.send_email import send_email
+
+# ====== Configuration ======
+ALERT_WINDOW_SECONDS = 15.0  # how long the first relevant item waits for company
+ALERT_MAX_BATCH = 5          # send immediately once this many items are waiting
+MAX_RELATED_LINKS = 10       # other outlets' links listed under one alert
+CLUSTER_HOLD_SECONDS = 120.0  # longest a clustered alert waits for other outlets' copies
+
+# Totals for this process: emails, items, and seconds from publication to sending
+ALERT_STATS: Dict[str, float] = {
+    "emails": 0,
+    "items": 0,
+    "publish_to_send_seconds": 0.0,
+    "max_publish_to_send_seconds": 0.0,
+}
+
+
+def alert_body(name: str, topic: str, multi_topic: bool, entries: List[Tuple]) -> str:
+    """Email body for (item, score, reason, meta, cluster) entries of one feed/topic."""
+    header = f"Found {len(entries)} relevant articles in {name}"
+    lines = [f"{header} for {topic}:\n" if multi_topic else f"{header}:\n"]
+    for item, score, reason, meta, cluster in entries:
+        lines.append("---")
+        lines.append(f"Title: {item.title}")
+        lines.append(f"Link: {item.link}")
+        if cluster is not None:
+            others = cluster.other_links(item.link)
+            for feed_name, link in others[:MAX_RELATED_LINKS]:
+                lines.append(f"Also covered by {feed_name}: {link}")
+            if len(others) > MAX_RELATED_LINKS:
+                lines.append(f"...and {len(others) - MAX_RELATED_LINKS} more outlets")
+        lines.append(f"Relevance Score: {score}")
+        lines.append(f"Scored by: {meta['tier']} ({meta['model']})")
+        lines.append(f"Reasoning: {reason}\n")
+    return "\n".join(lines)
+
+
+class AlertDispatcher:
+    """Time-windowed alert batches per (feed, topic), sent from background tasks."""
+
+    def __init__(self, email_cfg: Dict):
+        self.email_cfg = email_cfg
+        self.batches: Dict[Tuple[str, str], List[Tuple]] = {}
+        self.feeds: Dict[Tuple[str, str], Dict] = {}
+        self.timers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.sending: set = set()
+        self.held: set = set()  # send tasks waiting for settle()
+        self.links_settled = asyncio.Event()
+
+    def settle(self) -> None:
+        """Every feed has been parsed: cluster links are final, release held alerts."""
+        self.links_settled.set()
+
+    def add(self, feed: Dict, topic: str, entry: Tuple) -> None:
+        """Queue one (item, score, reason, meta, cluster) entry for alerting."""
+        key = (feed["name"], topic)
+        self.feeds[key] = feed
+        batch = self.batches.setdefault(key, [])
+        batch.append(entry)
+        if len(batch) >= ALERT_MAX_BATCH or ALERT_WINDOW_SECONDS <= 0:
+            self._flush(key)
+        elif key not in self.timers:
+            self.timers[key] = asyncio.create_task(self._flush_later(key))
+
+    async def _flush_later(self, key: Tuple[str, str]) -> None:
+        await asyncio.sleep(ALERT_WINDOW_SECONDS)
+        self.timers.pop(key, None)
+        self._flush(key)
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        entries = self.batches.pop(key, None)
+        if entries:
+            hold = not self.links_settled.is_set() and any(e[4] is not None for e in entries)
+            task = asyncio.create_task(self._send(key, entries, hold))
+            self.sending.add(task)
+            task.add_done_callback(self.sending.discard)
+            if hold:
+                self.held.add(task)
+                task.add_done_callback(self.held.discard)
+
+    async def _send(self, key: Tuple[str, str], entries: List[Tuple], hold: bool = False) -> None:
+        name, topic = key
+        if hold:
+            try:
+                await asyncio.wait_for(self.links_settled.wait(), CLUSTER_HOLD_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+        feed = self.feeds[key]
+        multi_topic = len(feed["topics"]) > 1
+        recipients = feed["subscriptions"][topic]["recipients"]
+        email_cfg = {**self.email_cfg, "to_emails": recipients} if recipients else self.email_cfg
+        subject = f"AI News Alert: {name}" + (f" ({topic})" if multi_topic else "")
+        try:
+            await asyncio.to_thread(
+                send_email, subject=subject, body=alert_body(name, topic, multi_topic, entries), **email_cfg
+            )
+        except Exception as e:
+            print(f"❌ Email failed for {name}: {e}")
+            return
+
+        now = datetime.now(timezone.utc)
+        ALERT_STATS["emails"] += 1
+        for item, *_ in entries:
+            if item.pub_date is None:
+                continue
+            delay = max(0.0, (now - item.pub_date).total_seconds())
+            ALERT_STATS["items"] += 1
+            ALERT_STATS["publish_to_send_seconds"] += delay
+            ALERT_STATS["max_publish_to_send_seconds"] = max(ALERT_STATS["max_publish_to_send_seconds"], delay)
+
+    async def flush_feed(self, name: str) -> None:
+        """
+        Send the feed's open batches now and wait for in-flight emails. Held alerts are
+        not waited for: they are released by settle() and awaited by close().
+        """
+        for key in [k for k in self.batches if k[0] == name]:
+            self._flush(key)
+        in_flight = self.sending - self.held
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Send every open batch and wait for all in-flight emails."""
+        self.settle()
+        for key in list(self.batches):
+            self._flush(key)
+        if self.sending:
+            await asyncio.gather(*list(self.sending), return_exceptions=True)
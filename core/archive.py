@@ -0,0 +1,347 @@
+"""
+SQLite archive of scored feed items with an FTS5 index over title/description.
+
+Written once per run in a single transaction; queried from the command line:
+    python -m core.archive search "openai AND microsoft" --days 30 --min-score 6
+    python -m core.archive stats
+    python -m core.archive prune --days 365
+    python -m core.archive compact
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ====== Configuration ======
+# Lambda's working directory is read-only; /tmp is the writable location there
+_DEFAULT_ARCHIVE = "/tmp/news_archive.db" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "news_archive.db"
+ARCHIVE_PATH = os.getenv("ARCHIVE_DB", _DEFAULT_ARCHIVE)
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", 365))
+COMPACT_AFTER_DELETES = 1000  # run compact() automatically once a prune removes this many rows
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "guccounter", "cmpid")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id            INTEGER PRIMARY KEY,
+    feed          TEXT NOT NULL,
+    topic         TEXT NOT NULL,
+    canonical_url TEXT NOT NULL,
+    link          TEXT,
+    title         TEXT,
+    description   TEXT,
+    pub_date      TEXT,
+    score         INTEGER,
+    reasoning     TEXT,
+    model         TEXT,
+    tier          TEXT,
+    cost_usd      REAL,
+    prompt_hash   TEXT,
+    scored_at     TEXT NOT NULL,
+    UNIQUE (canonical_url, topic)
+);
+CREATE INDEX IF NOT EXISTS idx_items_pub_date ON items (pub_date);
+CREATE INDEX IF NOT EXISTS idx_items_topic_score ON items (topic, score);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5 (
+    title, description,
+    content='items', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE OF title, description ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO items_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO items (
+    feed, topic, canonical_url, link, title, description, pub_date,
+    score, reasoning, model, tier, cost_usd, prompt_hash, scored_at
+) VALUES (
+    :feed, :topic, :canonical_url, :link, :title, :description, :pub_date,
+    :score, :reasoning, :model, :tier, :cost_usd, :prompt_hash, :scored_at
+)
+ON CONFLICT (canonical_url, topic) DO UPDATE SET
+    feed = excluded.feed,
+    link = excluded.link,
+    title = excluded.title,
+    description = excluded.description,
+    pub_date = excluded.pub_date,
+    score = COALESCE(excluded.score, items.score),
+    reasoning = CASE WHEN excluded.score IS NULL THEN items.reasoning ELSE excluded.reasoning END,
+    model = COALESCE(excluded.model, items.model),
+    tier = COALESCE(excluded.tier, items.tier),
+    cost_usd = COALESCE(items.cost_usd, 0) + COALESCE(excluded.cost_usd, 0),
+    prompt_hash = COALESCE(excluded.prompt_hash, items.prompt_hash),
+    scored_at = excluded.scored_at
+"""
+
+
+# ====== Helpers ======
+
+def canonicalize_url(url: str) -> str:
+    """Lowercase scheme/host, drop fragments, tracking parameters and trailing slashes."""
+    parts = urlsplit((url or "").strip())
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, query, ""))
+
+
+def prompt_hash(prompt: Optional[str]) -> str:
+    """Short stable hash of an LLM prompt, to tell which prompt produced a score."""
+    return hashlib.sha1((prompt or "").encode("utf-8")).hexdigest()[:12]
+
+
+def _iso(dt: Optional[datetime]) -> Optional[str]:
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") if dt else None
+
+
+def connect(path: str = ARCHIVE_PATH) -> sqlite3.Connection:
+    """Open (and if needed create) the archive database."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# ====== Write ======
+
+def archive_items(records: Iterable[Dict], path: str = ARCHIVE_PATH) -> int:
+    """
+    Upsert scored items in one transaction. Each record needs feed, topic, link, title,
+    description and pub_date (datetime); score, reasoning, model, tier, cost_usd and
+    prompt_hash are optional. Returns the number of rows written.
+    """
+    scored_at = _iso(datetime.now(timezone.utc))
+    rows = [
+        {
+            "feed": r["feed"],
+            "topic": r["topic"],
+            "canonical_url": canonicalize_url(r["link"]),
+            "link": r["link"],
+            "title": r["title"],
+            "description": r["description"],
+            "pub_date": _iso(r.get("pub_date")),
+            "score": r.get("score"),
+            "reasoning": r.get("reasoning"),
+            "model": r.get("model"),
+            "tier": r.get("tier"),
+            "cost_usd": r.get("cost_usd"),
+            "prompt_hash": r.get("prompt_hash"),
+            "scored_at": scored_at,
+        }
+        for r in records
+        if r.get("link")
+    ]
+    if not rows:
+        return 0
+
+    conn = connect(path)
+    try:
+        with conn:
+            conn.executemany(_UPSERT, rows)
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def apply_retention(days: int = ARCHIVE_RETENTION_DAYS, path: str = ARCHIVE_PATH) -> int:
+    """Delete items published (or scored, if undated) more than `days` ago."""
+    cutoff = _iso(datetime.now(timezone.utc) - timedelta(days=days))
+    conn = connect(path)
+    try:
+        with conn:
+            deleted = conn.execute(
+                "DELETE FROM items WHERE COALESCE(pub_date, scored_at) < ?", (cutoff,)
+            ).rowcount
+    finally:
+        conn.close()
+
+    if deleted >= COMPACT_AFTER_DELETES:
+        compact(path)
+    return deleted
+
+
+def compact(path: str = ARCHIVE_PATH) -> None:
+    """Merge FTS segments, update planner statistics and reclaim free pages."""
+    conn = connect(path)
+    try:
+        conn.execute("INSERT INTO items_fts (items_fts) VALUES ('optimize')")
+        conn.commit()
+        conn.execute("PRAGMA optimize")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+# ====== Read ======
+
+def scored_topics(links: Iterable[str], topics: Iterable[str], path: str = ARCHIVE_PATH) -> Set[Tuple[str, str]]:
+    """(canonical_url, topic) pairs among `links` x `topics` that already have a score."""
+    urls = sorted({canonicalize_url(link) for link in links})
+    topics = list(topics)
+    found: Set[Tuple[str, str]] = set()
+    if not urls or not topics:
+        return found
+    conn = connect(path)
+    try:
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            rows = conn.execute(
+                f"SELECT canonical_url, topic FROM items WHERE score IS NOT NULL "
+                f"AND canonical_url IN ({', '.join('?' * len(chunk))}) "
+                f"AND topic IN ({', '.join('?' * len(topics))})",
+                (*chunk, *topics),
+            ).fetchall()
+            found.update((row["canonical_url"], row["topic"]) for row in rows)
+    finally:
+        conn.close()
+    return found
+
+
+def search(
+    query: Optional[str] = None,
+    days: Optional[int] = None,
+    topic: Optional[str] = None,
+    feed: Optional[str] = None,
+    min_score: Optional[int] = None,
+    limit: int = 50,
+    path: str = ARCHIVE_PATH,
+) -> List[sqlite3.Row]:
+    """Full-text (FTS5 syntax) and/or filtered search, newest first."""
+    clauses, params = [], []
+    if query:
+        clauses.append("items.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)")
+        params.append(query)
+    if days is not None:
+        clauses.append("items.pub_date >= ?")
+        params.append(_iso(datetime.now(timezone.utc) - timedelta(days=days)))
+    if topic:
+        clauses.append("items.topic = ?")
+        params.append(topic)
+    if feed:
+        clauses.append("items.feed = ?")
+        params.append(feed)
+    if min_score is not None:
+        clauses.append("items.score >= ?")
+        params.append(min_score)
+
+    sql = "SELECT * FROM items"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY items.pub_date DESC LIMIT ?"
+    params.append(limit)
+
+    conn = connect(path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def stats(
+    threshold: int,
+    topic_thresholds: Optional[Dict[str, int]] = None,
+    path: str = ARCHIVE_PATH,
+) -> List[sqlite3.Row]:
+    """
+    Item counts, relevant counts, date range and total cost per feed/topic. An item is
+    relevant when it scores above its topic's entry in `topic_thresholds`, else `threshold`.
+    """
+    cases = "".join(" WHEN ? THEN ?" for _ in topic_thresholds or ())
+    limit = f"CASE topic{cases} ELSE ? END" if cases else "?"
+    params = [v for pair in (topic_thresholds or {}).items() for v in pair] + [threshold]
+    conn = connect(path)
+    try:
+        return conn.execute(
+            f"""
+            SELECT feed, topic, COUNT(*) AS items, SUM(score > {limit}) AS relevant,
+                   MIN(pub_date) AS oldest, MAX(pub_date) AS newest,
+                   ROUND(SUM(COALESCE(cost_usd, 0)), 4) AS cost_usd
+            FROM items GROUP BY feed, topic ORDER BY feed, topic
+            """,
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+# ====== CLI ======
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m core.archive", description="Query the news archive.")
+    parser.add_argument("--db", default=ARCHIVE_PATH, help="archive database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_search = sub.add_parser("search", help="full-text search over title/description")
+    p_search.add_argument("query", nargs="?", help="FTS5 query, e.g. 'openai AND microsoft'")
+    p_search.add_argument("--days", type=int)
+    p_search.add_argument("--topic")
+    p_search.add_argument("--feed")
+    p_search.add_argument("--min-score", type=int)
+    p_search.add_argument("--limit", type=int, default=50)
+
+    p_stats = sub.add_parser("stats", help="per feed/topic counts")
+    p_stats.add_argument("--threshold", type=int,
+                         help="count items scoring above this as relevant (default: each topic's alert threshold)")
+
+    p_prune = sub.add_parser("prune", help="apply the retention policy")
+    p_prune.add_argument("--days", type=int, default=ARCHIVE_RETENTION_DAYS)
+
+    sub.add_parser("compact", help="optimize the FTS index and vacuum")
+
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+
+    if args.command == "search":
+        rows = search(args.query, args.days, args.topic, args.feed, args.min_score, args.limit, args.db)
+        for row in rows:
+            print(f"[{row['pub_date']}] {row['feed']} | {row['topic']} | score={row['score']} ({row['tier']})")
+            print(f"    {row['title']}")
+            print(f"    {row['link']}")
+        print(f"{len(rows)} results in {(time.perf_counter() - started) * 1000:.1f} ms")
+    elif args.command == "stats":
+        if args.threshold is not None:
+            rows = stats(args.threshold, path=args.db)
+        else:
+            # Imported here: the pipeline imports this module
+            from core.pipeline import RELEVANCE_THRESHOLD
+            from config.feeds_config import REGISTRY
+            topic_thresholds = {
+                name: topic["threshold"] for name, topic in REGISTRY["topics"].items()
+                if topic.get("threshold") is not None
+            }
+            rows = stats(RELEVANCE_THRESHOLD, topic_thresholds, args.db)
+        for row in rows:
+            print(
+                f"{row['feed']} | {row['topic']}: {row['items']} items, {row['relevant']} relevant, "
+                f"{row['oldest']} .. {row['newest']}, ${row['cost_usd']}"
+            )
+    elif args.command == "prune":
+        print(f"Deleted {apply_retention(args.days, args.db)} items older than {args.days} days.")
+    elif args.command == "compact":
+        compact(args.db)
+        print(f"Compacted {args.db}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import re
+from collections import OrderedDict
+
+import aiohttp
+
+from core.rss_fetcher import fetch_url
+from core.text_sanitizer import html_to_text
+
+# ====== Configuration ======
+ARTICLE_MAX_BYTES = 3 * 1024 * 1024  # article pages are capped tighter than feeds
+ARTICLE_MAX_CHARS = 6000             # text passed on to the LLM
+ARTICLE_CACHE_SIZE = 512             # extracted articles kept in memory
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+# ====== Extraction ======
+
+_DROP_BLOCKS = re.compile(
+    r"<(script|style|noscript|iframe|nav|header|footer|aside|form|figure)[^>]*>.*?</\1>",
+    flags=re.DOTALL | re.IGNORECASE,
+)
+_ARTICLE_BLOCK = re.compile(r"<article[^>]*>(.*?)</article>", flags=re.DOTALL | re.IGNORECASE)
+_BODY_BLOCK = re.compile(r"<body[^>]*>(.*?)</body>", flags=re.DOTALL | re.IGNORECASE)
+_PARAGRAPH = re.compile(r"<p[^>]*>(.*?)</p>", flags=re.DOTALL | re.IGNORECASE)
+
+
+def extract_article_text(page: str, max_chars: int = ARTICLE_MAX_CHARS) -> str:
+    """
+    Pull readable body text out of an article page.
+    Prefers <p> paragraphs inside <article>, falls back to the whole <body>.
+    """
+    if not page:
+        return ""
+    page = _DROP_BLOCKS.sub(" ", page)
+
+    match = _ARTICLE_BLOCK.search(page) or _BODY_BLOCK.search(page)
+    scope = match.group(1) if match else page
+
+    paragraphs = [html_to_text(p) for p in _PARAGRAPH.findall(scope)]
+    text = " ".join(p for p in paragraphs if len(p) > 40)
+    if not text:
+        text = html_to_text(scope)
+
+    return text[:max_chars]
+
+
+# ====== Fetch ======
+
+async def fetch_article_text(session: aiohttp.ClientSession, url: str) -> str:
+    """
+    Fetch an article page and return its extracted text.
+    Results are cached by URL; per-host limits and retries come from fetch_url.
+    """
+    if not url:
+        return ""
+    if url in _cache:
+        _cache.move_to_end(url)
+        return _cache[url]
+
+    print(f"Fetching article: {url}")
+    page = await fetch_url(session, url, max_bytes=ARTICLE_MAX_BYTES)
+
+    text = extract_article_text(page.decode("utf-8", errors="ignore"))
+    _cache[url] = text
+    if len(_cache) > ARTICLE_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return text
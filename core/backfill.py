@@ -0,0 +1,408 @@
+"""
+Offline rescoring of archived items through a batch LLM endpoint.
+
+Archived items of a feed's topic whose score was produced by another prompt or model
+are streamed into JSONL request files in the OpenAI batch format, submitted, polled
+and ingested back into the archive. Progress is kept in the archive database, so an
+interrupted backfill resumes where it stopped when run again; items of failed batches
+or with errored results are prepared again:
+    python -m core.backfill run --feed "Tech Crunch" --days 60
+    python -m core.backfill run --feed Haberturk --backend local   # no batch API needed
+    python -m core.backfill status
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+from config.feeds_config import get_feed
+from core.archive import ARCHIVE_PATH, connect, prompt_hash
+from core.relevance_analyzer import build_relevance_messages
+from llm_call import LEAN_MAX_TOKENS, LEAN_REASONING_EFFORT, evaluation_response_format, parse_evaluation
+
+# ====== Configuration ======
+BACKFILL_DIR = os.getenv("BACKFILL_DIR", "backfill_jobs")
+BATCH_SIZE = 5000          # requests per JSONL file (OpenAI allows up to 50k)
+FETCH_CHUNK = 500          # archive rows read per round trip while writing a file
+INGEST_CHUNK = 1000        # result rows written per transaction
+POLL_INTERVAL_SECONDS = 60
+LOCAL_CONCURRENCY = 16
+RETRY_ROUNDS = 2           # with --wait, times failed/errored items are re-prepared per run
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backfill_batches (
+    job_id          TEXT NOT NULL,
+    batch_no        INTEGER NOT NULL,
+    input_path      TEXT NOT NULL,
+    first_item_id   INTEGER NOT NULL,
+    last_item_id    INTEGER NOT NULL,
+    requests        INTEGER NOT NULL,
+    status          TEXT NOT NULL,   -- prepared, submitted, completed, ingested, failed
+    remote_id       TEXT,
+    output_path     TEXT,
+    updated_at      TEXT NOT NULL,
+    PRIMARY KEY (job_id, batch_no)
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower()
+
+
+def _connect(path: str):
+    conn = connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# ====== Backends ======
+
+class OpenAIBatchBackend:
+    """OpenAI-compatible /v1/batches endpoint (half price, results within 24h)."""
+
+    def __init__(self):
+        self.client = OpenAI(
+            api_key=os.getenv("LLM_BATCH_API_KEY") or os.getenv("LLM_API_KEY"),
+            base_url=(os.getenv("LLM_BATCH_BASE_URL") or os.getenv("LLM_BASE_URL") or "").rstrip("/") or None,
+        )
+
+    def submit(self, input_path: str) -> str:
+        with open(input_path, "rb") as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def poll(self, remote_id: str, output_path: str) -> str:
+        """Return the batch status, downloading results once it is completed."""
+        batch = self.client.batches.retrieve(remote_id)
+        if batch.status == "completed":
+            with open(output_path, "wb") as out:
+                for file_id in (batch.output_file_id, batch.error_file_id):
+                    if file_id:
+                        out.write(self.client.files.content(file_id).read())
+            return "completed"
+        if batch.status in ("failed", "expired", "cancelled"):
+            return "failed"
+        return "submitted"
+
+
+class LocalBatchBackend:
+    """
+    Stand-in for the batch API: runs a request file against LLM_BASE_URL with bounded
+    concurrency and writes an output file in the batch result format. Used for testing
+    and for endpoints without batch support.
+    """
+
+    def submit(self, input_path: str) -> str:
+        return input_path
+
+    def poll(self, remote_id: str, output_path: str) -> str:
+        asyncio.run(self._run(remote_id, output_path))
+        return "completed"
+
+    async def _run(self, input_path: str, output_path: str) -> None:
+        client = AsyncOpenAI(
+            api_key=os.getenv("LLM_API_KEY"), base_url=(os.getenv("LLM_BASE_URL") or "").rstrip("/")
+        )
+
+        async def call(request: Dict) -> Dict:
+            try:
+                response = await client.chat.completions.create(**request["body"])
+                return {
+                    "custom_id": request["custom_id"],
+                    "response": {"status_code": 200, "body": response.model_dump()},
+                    "error": None,
+                }
+            except Exception as e:
+                return {"custom_id": request["custom_id"], "response": None, "error": {"message": str(e)}}
+
+        # Read and answer the file in windows so memory stays bounded by LOCAL_CONCURRENCY
+        with open(input_path, "r", encoding="utf-8") as src, open(output_path, "w", encoding="utf-8") as out:
+            window: List[Dict] = []
+            for line in src:
+                window.append(json.loads(line))
+                if len(window) >= LOCAL_CONCURRENCY:
+                    for result in await asyncio.gather(*(call(r) for r in window)):
+                        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    window = []
+            for result in await asyncio.gather(*(call(r) for r in window)):
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        await client.close()
+
+
+BACKENDS = {"openai": OpenAIBatchBackend, "local": LocalBatchBackend}
+
+
+# ====== Prepare ======
+
+def _pending_items(conn, job_id: str, topic: str, p_hash: str, model: str, since: Optional[str],
+                   after_id: int, limit: int) -> Iterator[Tuple]:
+    """
+    Stream up to `limit` archived items not yet scored with this prompt and model and not
+    covered by an outstanding batch of the job. Items of failed batches, and items whose
+    result errored in an ingested batch, are still unscored and so come back.
+    """
+    sql = (
+        "SELECT id, title, description FROM items "
+        "WHERE topic = ? AND id > ? AND (prompt_hash IS NOT ? OR model IS NOT ?) "
+        "AND NOT EXISTS (SELECT 1 FROM backfill_batches b WHERE b.job_id = ? "
+        "AND b.status IN ('prepared', 'submitted', 'completed') "
+        "AND items.id BETWEEN b.first_item_id AND b.last_item_id)"
+    )
+    params: List = [topic, after_id, p_hash, model, job_id]
+    if since:
+        sql += " AND pub_date >= ?"
+        params.append(since)
+    sql += " ORDER BY id LIMIT ?"
+    params.append(limit)
+
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(FETCH_CHUNK)
+        if not rows:
+            return
+        yield from rows
+
+
+def prepare_batches(conn, job_id: str, feed: Dict, model: str, since: Optional[str], job_dir: str) -> int:
+    """
+    Write request files for unscored items not covered by outstanding batches of this job.
+    Returns the number of new batch files.
+    """
+    topic = feed.get("topic", feed["name"])
+    p_hash = prompt_hash(feed["llm_prompt"])
+    response_format = evaluation_response_format(score_only=False)
+
+    last = conn.execute("SELECT MAX(batch_no) FROM backfill_batches WHERE job_id = ?", (job_id,)).fetchone()
+    batch_no, after_id = (last[0] or 0), 0
+    created = 0
+
+    while True:
+        batch_no += 1
+        input_path = os.path.join(job_dir, f"batch_{batch_no:05d}.jsonl")
+        first_id, last_id, count = None, None, 0
+
+        with open(input_path, "w", encoding="utf-8") as f:
+            for item_id, title, description in _pending_items(
+                conn, job_id, topic, p_hash, model, since, after_id, BATCH_SIZE
+            ):
+                request = {
+                    "custom_id": str(item_id),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "messages": build_relevance_messages(description or title or "", feed["llm_prompt"]),
+                        "temperature": 0.2,
+                        "max_tokens": LEAN_MAX_TOKENS,
+                        "response_format": response_format,
+                    },
+                }
+                if LEAN_REASONING_EFFORT:
+                    request["body"]["reasoning_effort"] = LEAN_REASONING_EFFORT
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+                first_id = item_id if first_id is None else first_id
+                last_id, count = item_id, count + 1
+
+        if not count:
+            os.remove(input_path)
+            return created
+
+        with conn:
+            conn.execute(
+                "INSERT INTO backfill_batches VALUES (?, ?, ?, ?, ?, ?, 'prepared', NULL, NULL, ?)",
+                (job_id, batch_no, input_path, first_id, last_id, count, _now()),
+            )
+        print(f"📝 Prepared {input_path} ({count} requests)")
+        after_id = last_id
+        created += 1
+
+
+# ====== Ingest ======
+
+def _iter_results(output_path: str, model: str) -> Iterator[Tuple[int, Optional[int], Optional[str], str]]:
+    """Yield (item_id, score, reasoning, response model) for each successful result line."""
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                continue
+            body = response["body"]
+            try:
+                evaluation = parse_evaluation(body["choices"][0]["message"]["content"])
+            except Exception:
+                continue
+            yield int(result["custom_id"]), evaluation.score, evaluation.reasoning, body.get("model") or model
+
+
+def ingest_results(conn, output_path: str, feed: Dict, model: str) -> int:
+    """
+    Write results back to the archive. Idempotent: re-ingesting sets the same values.
+    Rows record the requested `model`, which _pending_items matches on; the endpoint
+    may answer with a dated snapshot name, which is only reported.
+    """
+    p_hash = prompt_hash(feed["llm_prompt"])
+    written = 0
+    chunk: List[Tuple] = []
+    answered_by = set()
+
+    def flush():
+        with conn:
+            conn.executemany(
+                "UPDATE items SET score = ?, reasoning = ?, model = ?, tier = 'batch', "
+                "prompt_hash = ?, scored_at = ? WHERE id = ?",
+                chunk,
+            )
+
+    for item_id, score, reasoning, result_model in _iter_results(output_path, model):
+        answered_by.add(result_model)
+        chunk.append((score, reasoning, model, p_hash, _now(), item_id))
+        if len(chunk) >= INGEST_CHUNK:
+            flush()
+            written += len(chunk)
+            chunk = []
+    if chunk:
+        flush()
+        written += len(chunk)
+    if answered_by - {model}:
+        print(f"ℹ️ {model} was answered by {', '.join(sorted(answered_by))}")
+    return written
+
+
+# ====== Driver ======
+
+def _set_status(conn, job_id: str, batch_no: int, status: str, **fields) -> None:
+    assignments = ", ".join(f"{k} = ?" for k in ["status", "updated_at", *fields])
+    with conn:
+        conn.execute(
+            f"UPDATE backfill_batches SET {assignments} WHERE job_id = ? AND batch_no = ?",
+            (status, _now(), *fields.values(), job_id, batch_no),
+        )
+
+
+def run_backfill(feed_name: str, days: Optional[int], model: Optional[str], backend_name: str,
+                 wait: bool, path: str = ARCHIVE_PATH, topic: Optional[str] = None) -> None:
+    """Prepare, submit, poll and ingest; safe to interrupt and re-run."""
+    feed = get_feed(feed_name)
+    if feed is None:
+        raise ValueError(f"Unknown feed: {feed_name}")
+    if topic is not None:
+        if topic not in feed["subscriptions"]:
+            raise ValueError(f"Feed {feed_name} is not subscribed to topic {topic}")
+        feed = {**feed, "topic": topic, "llm_prompt": feed["subscriptions"][topic]["prompt"]}
+    model = model or feed["model_tiers"][-1]["model"]
+    if backend_name == "openai" and "/" in model:
+        raise ValueError(
+            f"{model} is a router model name; the OpenAI batch API needs a plain model name (use --model)"
+        )
+    topic = feed.get("topic", feed["name"])
+    since = (
+        (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        if days is not None else None
+    )
+
+    job_id = f"{_slug(topic)}-{prompt_hash(feed['llm_prompt'])}-{_slug(model)}"
+    job_dir = os.path.join(BACKFILL_DIR, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    backend = BACKENDS[backend_name]()
+    conn = _connect(path)
+
+    try:
+        prepare_batches(conn, job_id, feed, model, since, job_dir)
+        retries = 0
+
+        while True:
+            batches = conn.execute(
+                "SELECT batch_no, input_path, status, remote_id FROM backfill_batches "
+                "WHERE job_id = ? AND status NOT IN ('ingested', 'failed') ORDER BY batch_no",
+                (job_id,),
+            ).fetchall()
+            if not batches:
+                # Failed batches and errored results leave items unscored: queue them again
+                if wait and retries < RETRY_ROUNDS and prepare_batches(conn, job_id, feed, model, since, job_dir):
+                    retries += 1
+                    print(f"🔁 Re-prepared unscored items (retry {retries}/{RETRY_ROUNDS})")
+                    continue
+                break
+
+            still_running = False
+            for batch_no, input_path, status, remote_id in batches:
+                output_path = input_path.replace(".jsonl", ".out.jsonl")
+                if status == "prepared":
+                    remote_id = backend.submit(input_path)
+                    _set_status(conn, job_id, batch_no, "submitted", remote_id=remote_id)
+                    print(f"🚀 Submitted batch {batch_no} ({remote_id})")
+                    status = "submitted"
+                if status == "submitted":
+                    status = backend.poll(remote_id, output_path)
+                    if status != "submitted":
+                        _set_status(conn, job_id, batch_no, status, output_path=output_path)
+                        print(f"📬 Batch {batch_no}: {status}")
+                    still_running = still_running or status == "submitted"
+                if status == "completed":
+                    written = ingest_results(conn, output_path, feed, model)
+                    _set_status(conn, job_id, batch_no, "ingested")
+                    print(f"✅ Ingested batch {batch_no}: {written} items rescored")
+
+            if not wait:
+                break
+            if still_running:
+                time.sleep(POLL_INTERVAL_SECONDS)
+    finally:
+        conn.close()
+
+
+def print_status(path: str = ARCHIVE_PATH) -> None:
+    conn = _connect(path)
+    try:
+        for row in conn.execute(
+            "SELECT job_id, status, COUNT(*), SUM(requests) FROM backfill_batches "
+            "GROUP BY job_id, status ORDER BY job_id, status"
+        ):
+            print(f"{row[0]}: {row[2]} batches {row[1]} ({row[3]} requests)")
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(prog="python -m core.backfill", description="Batch-rescore archived items.")
+    parser.add_argument("--db", default=ARCHIVE_PATH, help="archive database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="prepare/submit/poll/ingest (resumable)")
+    p_run.add_argument("--feed", required=True, help="feed name from the registry (its prompt and topic are used)")
+    p_run.add_argument("--topic", help="one of the feed's topics (default: its first)")
+    p_run.add_argument("--days", type=int, help="only items published in the last N days")
+    p_run.add_argument("--model", help="defaults to the feed's strongest model tier")
+    p_run.add_argument("--backend", choices=sorted(BACKENDS), default="openai")
+    p_run.add_argument("--no-wait", action="store_true", help="submit and return instead of polling to completion")
+
+    sub.add_parser("status", help="show batch progress per job")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run_backfill(args.feed, args.days, args.model, args.backend, not args.no_wait, args.db, args.topic)
+    else:
+        print_status(args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Near-duplicate story detection across outlets.
+
+Title + description are reduced to a set of content words, summarized by a MinHash
+signature and bucketed with LSH banding, so coverage of the same announcement by
+several outlets lands in one cluster even with different URLs and reworded text.
+Clusters are kept per topic in a rolling window persisted to the archive database.
+"""
+import json
+import re
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from core.archive import ARCHIVE_PATH, canonicalize_url, connect
+from core.feed_item import FeedItem
+
+# ====== Configuration ======
+DEDUP_WINDOW_HOURS = 48
+MINHASH_PERMUTATIONS = 60
+LSH_BANDS = 20               # 20 bands x 3 rows: candidates from roughly 0.35 Jaccard up
+DEDUP_MIN_JACCARD = 0.45     # estimated similarity needed to join a cluster
+MIN_TOKENS = 4               # shorter texts are never clustered
+
+_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed coefficients so signatures stay comparable across runs
+_PERMUTATIONS = [
+    ((i * 0x9E3779B1 + 0x7F4A7C15) % _PRIME | 1, (i * 0x85EBCA6B + 0xC2B2AE35) % _PRIME)
+    for i in range(1, MINHASH_PERMUTATIONS + 1)
+]
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "the a an and or but of to in on for with at by from as is are was were be been has have had "
+    "its it this that these those will would can could new says said after over into about than "
+    "more most also just not you your our their they we he she his her who what when how why "
+    "ve bir ile için bu da de ki olarak gibi daha en çok".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS story_clusters (
+    id          TEXT NOT NULL,
+    topic       TEXT NOT NULL,
+    rep_link    TEXT NOT NULL,
+    signature   BLOB NOT NULL,
+    links       TEXT NOT NULL,   -- JSON list of [feed, link]
+    score       INTEGER,
+    last_seen   TEXT NOT NULL,
+    PRIMARY KEY (id, topic)
+);
+CREATE INDEX IF NOT EXISTS idx_story_clusters_last_seen ON story_clusters (last_seen);
+"""
+
+
+def shingles(text: str) -> set:
+    """Lowercased content words of at least three characters."""
+    return {w for w in _WORD.findall(text.lower()) if len(w) > 2 and w not in _STOPWORDS}
+
+
+def minhash(tokens: set) -> Tuple[int, ...]:
+    """MinHash signature over crc32 token hashes (stable across processes)."""
+    hashes = [zlib.crc32(t.encode("utf-8")) for t in tokens]
+    return tuple(
+        min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def _bands(signature: Tuple[int, ...]) -> List[Tuple]:
+    return [(i, signature[i * _ROWS:(i + 1) * _ROWS]) for i in range(LSH_BANDS)]
+
+
+class StoryCluster:
+    """Coverage of one story under one topic: a representative plus every outlet link."""
+
+    __slots__ = ("id", "topic", "rep_link", "signature", "links", "score", "last_seen", "dirty")
+
+    def __init__(self, cluster_id, topic, rep_link, signature, links, score, last_seen):
+        self.id = cluster_id
+        self.topic = topic
+        self.rep_link = rep_link
+        self.signature = signature
+        self.links: List[Tuple[str, str]] = links
+        self.score: Optional[int] = score
+        self.last_seen: datetime = last_seen
+        self.dirty = False
+
+    def other_links(self, link: str) -> List[Tuple[str, str]]:
+        return [(feed, l) for feed, l in self.links if l != link]
+
+
+class DedupIndex:
+    """In-memory LSH index over the rolling window of clusters, per topic."""
+
+    def __init__(self, path: str = ARCHIVE_PATH):
+        self.path = path
+        self.clusters: Dict[Tuple[str, str], StoryCluster] = {}
+        self.buckets: Dict[Tuple, List[StoryCluster]] = {}
+        self.duplicates = 0
+
+    @classmethod
+    def load(cls, path: str = ARCHIVE_PATH) -> "DedupIndex":
+        """Load clusters seen within DEDUP_WINDOW_HOURS."""
+        index = cls(path)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=DEDUP_WINDOW_HOURS)
+        conn = connect(path)
+        try:
+            conn.executescript(_SCHEMA)
+            rows = conn.execute(
+                "SELECT id, topic, rep_link, signature, links, score, last_seen "
+                "FROM story_clusters WHERE last_seen >= ?",
+                (cutoff.isoformat(),),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        for row in rows:
+            signature = struct.unpack(f"<{MINHASH_PERMUTATIONS}I", row["signature"])
+            cluster = StoryCluster(
+                row["id"], row["topic"], row["rep_link"], signature,
+                [tuple(x) for x in json.loads(row["links"])], row["score"],
+                datetime.fromisoformat(row["last_seen"]),
+            )
+            index._add(cluster)
+        return index
+
+    def _add(self, cluster: StoryCluster) -> None:
+        self.clusters[(cluster.id, cluster.topic)] = cluster
+        for band in _bands(cluster.signature):
+            self.buckets.setdefault((cluster.topic, band), []).append(cluster)
+
+    def assign(self, item: FeedItem, topic: str, resumed: bool = False) -> Tuple[Optional[StoryCluster], bool]:
+        """
+        Put an item into its story cluster for `topic`.
+        Returns (cluster, is_representative). The first item of a story becomes the
+        representative and should be scored; later items are duplicates whose links
+        are attached to the cluster, including repeats of the representative's own URL.
+        Only a `resumed` (checkpointed) representative is handed back to be scored again.
+        Very short texts get (None, True).
+        """
+        tokens = shingles(f"{item.title} {item.description}")
+        if len(tokens) < MIN_TOKENS:
+            return None, True
+        signature = minhash(tokens)
+        now = datetime.now(timezone.utc)
+
+        best, best_sim = None, 0.0
+        seen = set()
+        for band in _bands(signature):
+            for candidate in self.buckets.get((topic, band), ()):
+                if id(candidate) in seen:
+                    continue
+                seen.add(id(candidate))
+                sim = similarity(signature, candidate.signature)
+                if sim > best_sim:
+                    best, best_sim = candidate, sim
+
+        if best is not None and best_sim >= DEDUP_MIN_JACCARD:
+            canonical = canonicalize_url(item.link)
+            if resumed and canonical == canonicalize_url(best.rep_link):
+                return best, True
+            if all(canonicalize_url(l) != canonical for _, l in best.links):
+                best.links.append((item.feed, item.link))
+            best.last_seen = now
+            best.dirty = True
+            self.duplicates += 1
+            return best, False
+
+        cluster_id = format(zlib.crc32(canonicalize_url(item.link).encode("utf-8")), "08x")
+        cluster = StoryCluster(cluster_id, topic, item.link, signature, [(item.feed, item.link)], None, now)
+        cluster.dirty = True
+        self._add(cluster)
+        return cluster, True
+
+    def save(self) -> int:
+        """Persist new/changed clusters and drop those older than the window."""
+        dirty = [c for c in self.clusters.values() if c.dirty]
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=DEDUP_WINDOW_HOURS)
+        conn = connect(self.path)
+        try:
+            conn.executescript(_SCHEMA)
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO story_clusters VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            c.id, c.topic, c.rep_link,
+                            struct.pack(f"<{MINHASH_PERMUTATIONS}I", *c.signature),
+                            json.dumps(c.links, ensure_ascii=False), c.score, c.last_seen.isoformat(),
+                        )
+                        for c in dirty
+                    ],
+                )
+                conn.execute("DELETE FROM story_clusters WHERE last_seen < ?", (cutoff.isoformat(),))
+        finally:
+            conn.close()
+        for c in dirty:
+            c.dirty = False
+        return len(dirty)
@@ -0,0 +1,281 @@
+"""
+Offline relevance evaluation.
+
+Runs a labelled set of articles through one scoring configuration and reports
+precision/recall per threshold, latency percentiles, token usage and cost:
+    python -m core.evaluate run labels.jsonl --topic company_relationships
+    python -m core.evaluate run labels.jsonl --topic turkish_military --model openai/gpt-5-nano --max-chars 400
+    python -m core.evaluate run labels.jsonl --feed Haberturk --record runs/haberturk.jsonl
+    python -m core.evaluate run labels.jsonl --feed Haberturk --replay runs/haberturk.jsonl
+    python -m core.evaluate export --topic company_relationships --limit 300 > labels.jsonl
+
+Labels are JSON lines with title, description and relevant (true/false); id and topic
+are optional. Point LLM_BASE_URL at a local mock endpoint to exercise a configuration
+without spending tokens, or replay responses recorded by an earlier --record run.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from config.feeds_config import REGISTRY, get_feed
+from core.archive import ARCHIVE_PATH, connect
+from core.relevance_analyzer import score_with_cascade_async
+
+# ====== Configuration ======
+DEFAULT_THRESHOLDS = [3, 4, 5, 6, 7]
+DEFAULT_CONCURRENCY = 16
+
+
+def load_labels(path: str, topic: Optional[str] = None) -> List[Dict]:
+    """Labelled items from JSONL, keeping those without a topic or with `topic`."""
+    labels = []
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            label = json.loads(line)
+            if not isinstance(label.get("relevant"), bool):
+                raise ValueError(f"{path}:{n}: 'relevant' must be true or false")
+            if topic and label.get("topic") not in (None, topic):
+                continue
+            label.setdefault("id", str(n))
+            labels.append(label)
+    return labels
+
+
+def build_config(args) -> Dict:
+    """Prompt, model tiers and cascade settings for one evaluation run."""
+    feed = get_feed(args.feed) if args.feed else None
+    if args.feed and feed is None:
+        raise ValueError(f"Unknown feed: {args.feed}")
+    topic = args.topic or (feed["topic"] if feed else None)
+    if topic not in REGISTRY["topics"]:
+        raise ValueError(f"Unknown topic: {topic!r} (use --topic or --feed)")
+
+    prompt = REGISTRY["topics"][topic]["prompt"]
+    if args.prompt_file:
+        with open(args.prompt_file, "r", encoding="utf-8") as f:
+            prompt = f.read().strip()
+
+    source = feed or REGISTRY["defaults"]
+    tiers = source["model_tiers"]
+    if args.model:
+        known = next((t for t in tiers if t["model"] == args.model), None)
+        tiers = [known or {
+            "name": "eval",
+            "model": args.model,
+            "input_cost_per_mtok": args.input_cost,
+            "output_cost_per_mtok": args.output_cost,
+        }]
+    return {
+        "topic": topic,
+        "prompt": prompt,
+        "model_tiers": tiers,
+        "escalation_band": tuple(source["escalation_band"]),
+        "min_confidence": source["min_confidence"],
+        "max_chars": args.max_chars,
+        "early_exit_max_score": args.early_exit,
+    }
+
+
+def _response_key(config: Dict, text: str) -> str:
+    """Identifies one (configuration, input) pair in a recording."""
+    parts = [config["prompt"], [t["model"] for t in config["model_tiers"]],
+             list(config["escalation_band"]), config["min_confidence"], config["early_exit_max_score"], text]
+    return hashlib.sha1(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# ====== Run ======
+
+async def score_labels(
+    labels: List[Dict],
+    config: Dict,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    replay: Optional[Dict[str, Dict]] = None,
+) -> List[Dict]:
+    """Score every label's description; with `replay`, recorded responses are used instead."""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(label: Dict) -> Dict:
+        text = label.get("description") or label.get("title") or ""
+        if config["max_chars"]:
+            text = text[:config["max_chars"]]
+        key = _response_key(config, text)
+        result = {"key": key, "id": label["id"], "relevant": label["relevant"]}
+
+        if replay is not None:
+            recorded = replay.get(key)
+            if recorded is None:
+                return {**result, "score": None, "error": "not recorded"}
+            return {**recorded, **result}
+
+        try:
+            evaluation, meta = await score_with_cascade_async(
+                text, sem, config["prompt"], config["model_tiers"], config["escalation_band"],
+                config["min_confidence"], early_exit_max_score=config["early_exit_max_score"],
+            )
+        except Exception as e:
+            return {**result, "score": None, "error": str(e)}
+        return {
+            **result,
+            "score": evaluation.score,
+            "tier": meta["tier"],
+            "latency_seconds": sum(t["latency_seconds"] for t in meta["tiers"]),
+            "prompt_tokens": sum(t["prompt_tokens"] for t in meta["tiers"]),
+            "completion_tokens": sum(t["completion_tokens"] for t in meta["tiers"]),
+            "cost_usd": sum(t["cost_usd"] for t in meta["tiers"]),
+        }
+
+    return await asyncio.gather(*(one(label) for label in labels))
+
+
+def _pct(values: List[float], p: float) -> float:
+    return values[min(len(values) - 1, int(p * len(values)))] if values else 0.0
+
+
+def summarize(results: List[Dict], thresholds: List[int]) -> Dict:
+    """
+    Precision/recall/F1 per threshold (an item is an alert when score > threshold),
+    latency percentiles, tokens and cost. Failed items count as missed alerts.
+    """
+    by_threshold = {}
+    for t in thresholds:
+        tp = sum(1 for r in results if r["relevant"] and r["score"] is not None and r["score"] > t)
+        fp = sum(1 for r in results if not r["relevant"] and r["score"] is not None and r["score"] > t)
+        fn = sum(1 for r in results if r["relevant"]) - tp
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        by_threshold[t] = {"tp": tp, "fp": fp, "fn": fn, "precision": precision, "recall": recall, "f1": f1}
+
+    scored = [r for r in results if r["score"] is not None]
+    latencies = sorted(r.get("latency_seconds", 0.0) for r in scored)
+    prompt_tokens = sum(r.get("prompt_tokens", 0) for r in scored)
+    completion_tokens = sum(r.get("completion_tokens", 0) for r in scored)
+    cost = sum(r.get("cost_usd", 0.0) for r in scored)
+    tiers: Dict[str, int] = {}
+    for r in scored:
+        tiers[r.get("tier") or "?"] = tiers.get(r.get("tier") or "?", 0) + 1
+    return {
+        "items": len(results),
+        "positives": sum(1 for r in results if r["relevant"]),
+        "errors": len(results) - len(scored),
+        "thresholds": by_threshold,
+        "latency": {"p50": _pct(latencies, 0.50), "p95": _pct(latencies, 0.95), "p99": _pct(latencies, 0.99)},
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": cost,
+        "cost_per_1k_items_usd": cost / len(scored) * 1000 if scored else 0.0,
+        "final_tiers": tiers,
+    }
+
+
+def print_summary(config: Dict, summary: Dict) -> None:
+    models = " -> ".join(t["model"] for t in config["model_tiers"])
+    print(f"Topic {config['topic']} | {models} | max_chars={config['max_chars']} "
+          f"| early_exit={config['early_exit_max_score']}")
+    print(f"{summary['items']} items, {summary['positives']} relevant, {summary['errors']} errors, "
+          f"final tiers {summary['final_tiers']}")
+    print("threshold  precision  recall   f1     tp   fp   fn")
+    for t, m in summary["thresholds"].items():
+        print(f"  > {t:<6} {m['precision']:>8.2f} {m['recall']:>7.2f} {m['f1']:>6.2f} "
+              f"{m['tp']:>4} {m['fp']:>4} {m['fn']:>4}")
+    latency = summary["latency"]
+    print(f"latency p50 {latency['p50']:.2f}s, p95 {latency['p95']:.2f}s, p99 {latency['p99']:.2f}s")
+    print(f"tokens {summary['prompt_tokens']:.0f} prompt + {summary['completion_tokens']:.0f} completion, "
+          f"${summary['cost_usd']:.4f} (${summary['cost_per_1k_items_usd']:.4f} per 1k items)")
+
+
+def run_evaluation(args) -> Dict:
+    config = build_config(args)
+    labels = load_labels(args.labels, config["topic"])
+    if not labels:
+        raise ValueError(f"No labels for topic {config['topic']} in {args.labels}")
+
+    replay = None
+    if args.replay:
+        with open(args.replay, "r", encoding="utf-8") as f:
+            replay = {r["key"]: r for r in map(json.loads, filter(str.strip, f))}
+
+    results = asyncio.run(score_labels(labels, config, args.concurrency, replay))
+
+    if args.record:
+        with open(args.record, "a", encoding="utf-8") as f:
+            for r in results:
+                if r["score"] is not None:
+                    f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+    summary = summarize(results, args.thresholds)
+    print_summary(config, summary)
+    if args.json:
+        report = {"config": {**config, "prompt_chars": len(config["prompt"])}, "summary": summary}
+        report["config"].pop("prompt")
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+# ====== Export ======
+
+def export_candidates(topic: str, limit: int, path: str = ARCHIVE_PATH) -> None:
+    """Print random archived items of a topic as label templates (relevant: null, fill in by hand)."""
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT id, title, description, link, score FROM items "
+            "WHERE topic = ? AND description IS NOT NULL ORDER BY RANDOM() LIMIT ?",
+            (topic, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+    for row in rows:
+        print(json.dumps({
+            "id": str(row["id"]), "topic": topic, "title": row["title"], "description": row["description"],
+            "link": row["link"], "archived_score": row["score"], "relevant": None,
+        }, ensure_ascii=False))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(prog="python -m core.evaluate", description="Evaluate relevance scoring offline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="score a labelled set and report accuracy, latency and cost")
+    p_run.add_argument("labels", help="JSONL file with title, description and relevant")
+    p_run.add_argument("--topic", help="registry topic whose prompt is evaluated")
+    p_run.add_argument("--feed", help="use a feed's first topic and its model cascade")
+    p_run.add_argument("--prompt-file", help="evaluate this prompt text instead of the registry's")
+    p_run.add_argument("--model", help="score with this single model instead of the cascade")
+    p_run.add_argument("--input-cost", type=float, default=0.0, help="USD per million input tokens for --model")
+    p_run.add_argument("--output-cost", type=float, default=0.0, help="USD per million output tokens for --model")
+    p_run.add_argument("--max-chars", type=int, help="truncate descriptions to this many characters")
+    p_run.add_argument("--early-exit", type=int, help="stream and stop once the score is at or below this")
+    p_run.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    p_run.add_argument("--thresholds", type=lambda s: [int(x) for x in s.split(",")], default=DEFAULT_THRESHOLDS)
+    p_run.add_argument("--record", help="append responses to this JSONL file for later --replay")
+    p_run.add_argument("--replay", help="use responses recorded by --record instead of calling the LLM")
+    p_run.add_argument("--json", help="also write the report to this file")
+
+    p_export = sub.add_parser("export", help="print archived items as label templates")
+    p_export.add_argument("--topic", required=True)
+    p_export.add_argument("--limit", type=int, default=200)
+    p_export.add_argument("--db", default=ARCHIVE_PATH, help="archive database path")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "run":
+            run_evaluation(args)
+        else:
+            export_candidates(args.topic, args.limit, args.db)
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
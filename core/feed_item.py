@@ -0,0 +1,65 @@
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(slots=True)
+class FeedItem:
+    """
+    One parsed feed entry, shared by all parsers and pipeline stages.
+    Slotted (no per-instance __dict__); the feed name is interned so thousands of
+    items share one string. Optional fields default to None rather than "".
+    """
+
+    title: str
+    link: str
+    description: str
+    pub_date: Optional[datetime]
+    feed: str = ""
+    image: Optional[str] = None
+    author: Optional[str] = None
+
+    def __post_init__(self):
+        self.feed = sys.intern(self.feed)
+
+    # ====== Serialization ======
+
+    def to_tuple(self) -> Tuple:
+        """Positional form for pickling to worker pools or compact caches."""
+        return (self.title, self.link, self.description, self.pub_date, self.feed, self.image, self.author)
+
+    @classmethod
+    def from_tuple(cls, values: Tuple) -> "FeedItem":
+        return cls(*values)
+
+    def __reduce__(self):
+        return (FeedItem.from_tuple, (self.to_tuple(),))
+
+    def to_json(self) -> Dict:
+        """JSON-safe dict (pub_date as ISO 8601), omitting unset optional fields."""
+        data = {
+            "title": self.title,
+            "link": self.link,
+            "description": self.description,
+            "pub_date": self.pub_date.isoformat() if self.pub_date else None,
+            "feed": self.feed,
+        }
+        if self.image:
+            data["image"] = self.image
+        if self.author:
+            data["author"] = self.author
+        return data
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "FeedItem":
+        pub_date = data.get("pub_date")
+        return cls(
+            title=data["title"],
+            link=data["link"],
+            description=data["description"],
+            pub_date=datetime.fromisoformat(pub_date) if pub_date else None,
+            feed=data.get("feed", ""),
+            image=data.get("image"),
+            author=data.get("author"),
+        )
@@ -1,27 +1,28 @@
 import os
 import json
 from datetime import datetime, timezone
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 STATE_FILE = "rss_state.json"
+PENDING_FILE = "pending_items.json"
 
 
 # ====== State Management ======
 
-def _load_state() -> Dict[str, str]:
+def _load_state(path: str = STATE_FILE) -> Dict:
     """Load the entire RSS state JSON (feed name -> timestamp)."""
-    if not os.path.exists(STATE_FILE):
+    if not os.path.exists(path):
         return {}
-    with open(STATE_FILE, "r", encoding="utf-8") as f:
+    with open(path, "r", encoding="utf-8") as f:
         try:
             return json.load(f)
         except json.JSONDecodeError:
             return {}
 
 
-def _save_state(data: Dict[str, str]) -> None:
+def _save_state(data: Dict, path: str = STATE_FILE) -> None:
     """Save the entire RSS state JSON."""
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
+    with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
@@ -45,6 +46,21 @@ def save_last_run_time(feed_name: str, dt: datetime) -> None:
     _save_state(data)
 
 
+def load_pending_items(feed_name: str) -> List[Dict]:
+    """Load the checkpointed (unscored or failed) items of a feed."""
+    return _load_state(PENDING_FILE).get(feed_name, [])
+
+
+def save_pending_items(feed_name: str, entries: List[Dict]) -> None:
+    """Replace the checkpointed items of a feed (an empty list clears them)."""
+    data = _load_state(PENDING_FILE)
+    if entries:
+        data[feed_name] = entries
+    else:
+        data.pop(feed_name, None)
+    _save_state(data, PENDING_FILE)
+
+
 # ====== Relevance Helper ======
 
 def extract_score_reason(result):
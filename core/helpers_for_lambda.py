@@ -3,7 +3,7 @@
 import os
 import json
 from datetime import datetime, timezone
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 import boto3
 from botocore.exceptions import ClientError
 
@@ -11,20 +11,22 @@ from botocore.exceptions import ClientError
 BUCKET_NAME = "news-analyzer-timelog"
 STATE_FILE_KEY = "rss_state.json"
 LOCAL_FALLBACK_PATH = "/tmp/rss_state.json"
+PENDING_FILE_KEY = "pending_items.json"
+LOCAL_PENDING_FALLBACK_PATH = "/tmp/pending_items.json"
 
 s3 = boto3.client("s3")
 
 
 # ====== State Management ======
 
-def _load_state() -> Dict[str, str]:
+def _load_state(key: str = STATE_FILE_KEY, fallback_path: str = LOCAL_FALLBACK_PATH) -> Dict:
     """Load the entire RSS state JSON (feed name -> timestamp) from S3 or fallback."""
     # Try loading from S3
     try:
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=STATE_FILE_KEY)
+        response = s3.get_object(Bucket=BUCKET_NAME, Key=key)
         content = response["Body"].read().decode("utf-8")
         data = json.loads(content)
-        print(f"[INFO] Loaded state from s3://{BUCKET_NAME}/{STATE_FILE_KEY}")
+        print(f"[INFO] Loaded state from s3://{BUCKET_NAME}/{key}")
         return data
     except s3.exceptions.NoSuchKey:
         print("[INFO] State file not found in S3 — starting fresh.")
@@ -33,9 +35,9 @@ def _load_state() -> Dict[str, str]:
         print(f"[WARN] Could not load state from S3: {e}")
 
     # Fallback to local /tmp if available
-    if os.path.exists(LOCAL_FALLBACK_PATH):
+    if os.path.exists(fallback_path):
         try:
-            with open(LOCAL_FALLBACK_PATH, "r", encoding="utf-8") as f:
+            with open(fallback_path, "r", encoding="utf-8") as f:
                 return json.load(f)
         except Exception as e:
             print(f"[WARN] Failed to load fallback state: {e}")
@@ -43,7 +45,7 @@ def _load_state() -> Dict[str, str]:
     return {}
 
 
-def _save_state(data: Dict[str, str]) -> None:
+def _save_state(data: Dict, key: str = STATE_FILE_KEY, fallback_path: str = LOCAL_FALLBACK_PATH) -> None:
     """Save the entire RSS state JSON to S3 (with local /tmp fallback)."""
     json_data = json.dumps(data, ensure_ascii=False, indent=2)
 
@@ -51,20 +53,20 @@ def _save_state(data: Dict[str, str]) -> None:
     try:
         s3.put_object(
             Bucket=BUCKET_NAME,
-            Key=STATE_FILE_KEY,
+            Key=key,
             Body=json_data.encode("utf-8"),
             ContentType="application/json"
         )
-        print(f"[INFO] Saved state to s3://{BUCKET_NAME}/{STATE_FILE_KEY}")
+        print(f"[INFO] Saved state to s3://{BUCKET_NAME}/{key}")
         return
     except ClientError as e:
         print(f"[ERROR] Failed to save state to S3: {e}")
 
     # Fallback to /tmp
     try:
-        with open(LOCAL_FALLBACK_PATH, "w", encoding="utf-8") as f:
+        with open(fallback_path, "w", encoding="utf-8") as f:
             f.write(json_data)
-        print(f"[INFO] Saved fallback state to {LOCAL_FALLBACK_PATH}")
+        print(f"[INFO] Saved fallback state to {fallback_path}")
     except Exception as err:
         print(f"[ERROR] Could not save fallback state: {err}")
 
@@ -89,6 +91,21 @@ def save_last_run_time(feed_name: str, dt: datetime) -> None:
     _save_state(data)
 
 
+def load_pending_items(feed_name: str) -> List[Dict]:
+    """Load the checkpointed (unscored or failed) items of a feed."""
+    return _load_state(PENDING_FILE_KEY, LOCAL_PENDING_FALLBACK_PATH).get(feed_name, [])
+
+
+def save_pending_items(feed_name: str, entries: List[Dict]) -> None:
+    """Replace the checkpointed items of a feed (an empty list clears them)."""
+    data = _load_state(PENDING_FILE_KEY, LOCAL_PENDING_FALLBACK_PATH)
+    if entries:
+        data[feed_name] = entries
+    else:
+        data.pop(feed_name, None)
+    _save_state(data, PENDING_FILE_KEY, LOCAL_PENDING_FALLBACK_PATH)
+
+
 # ====== Relevance Helper ======
 
 def extract_score_reason(result):
@@ -0,0 +1,618 @@
+"""
+Staged feed pipeline: fetch -> parse -> score -> notify.
+
+Stages are connected by bounded asyncio queues and each runs its own pool of
+workers, so items flow to scoring as soon as their feed is parsed and a slow stage
+applies backpressure to the ones before it instead of letting work pile up in memory.
+
+Items wait for scoring in a priority queue: checkpointed items of earlier runs first,
+then items that similar past verdicts suggest are relevant, each newest first. Relevant
+items are emailed as soon as they are scored (see core.alerts). With a run deadline, work that cannot finish in time is skipped or
+cancelled, its items checkpointed for the next run, and the last run time of a feed
+URL only advances once all of its fetched items were handled or checkpointed.
+"""
+import asyncio
+import itertools
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.helpers import (
+    load_last_run_time, save_last_run_time, load_pending_items, save_pending_items, extract_score_reason
+)
+from core.rss_fetcher import fetch_feed_content
+from core.relevance_analyzer import score_with_cascade_async, score_topics_with_cascade_async
+from core.article_fetcher import fetch_article_text
+from core.archive import archive_items, canonicalize_url, prompt_hash, scored_topics
+from core.send_email import send_email
+from core.alerts import AlertDispatcher
+from core.feed_item import FeedItem
+from core.dedup import DedupIndex
+from core.score_reuse import REUSE_STATS, ScoreReuseIndex, record_audit, should_audit
+
+RELEVANCE_THRESHOLD = 5  # items scoring above this are emailed, unless the topic sets its own
+# Stream first-pass scoring and stop generating once score <= threshold - margin
+STREAM_SCORING = True
+STREAM_EARLY_EXIT_MARGIN = 1
+# Reuse the score of near-identical, already scored items instead of calling the LLM
+SCORE_REUSE = True
+
+# ====== Stage sizing ======
+FETCH_WORKERS = 8
+PARSE_WORKERS = 2
+NOTIFY_WORKERS = 1
+RAW_QUEUE_SIZE = 4        # fetched documents waiting for a parser (can be megabytes each)
+ITEM_QUEUE_SIZE = 128     # parsed items waiting for a score worker
+RESULT_QUEUE_SIZE = 128   # scored items waiting for the notifier
+ARCHIVE_FLUSH_SIZE = 200  # archive rows buffered before a bulk write
+
+# ====== Deadline and checkpointing ======
+DEADLINE_MARGIN_SECONDS = 20  # reserved before the deadline for emails and checkpoints
+MAX_PENDING_ATTEMPTS = 3      # runs a checkpointed item is retried before it is dropped
+
+
+class FeedRun:
+    """
+    Per-feed state for one pipeline run. `pending` counts feed URLs not yet parsed plus
+    items not yet notified; the feed is finalized when it drops to zero.
+    `incomplete` holds feed URLs that were not fetched and parsed, `unfinished` holds
+    items to checkpoint and `attempts` how often checkpointed items were tried before.
+    `url_last_run` holds each URL's own last run time, falling back to the feed's.
+    """
+
+    def __init__(self, feed: Dict, last_run: Optional[datetime], start_time: datetime,
+                 url_last_run: Dict[str, Optional[datetime]]):
+        self.feed = feed
+        self.name = feed["name"]
+        self.last_run = last_run
+        self.url_last_run = url_last_run
+        self.start_time = start_time
+        self.reuse_keys = {
+            topic: (topic, prompt_hash(sub["prompt"])) for topic, sub in feed["subscriptions"].items()
+        }
+        self.pending = len(feed["urls"])
+        self.new_items = 0
+        self.relevant = 0
+        self.errors: List[str] = []
+        self.incomplete: Set[str] = set()
+        self.unfinished: List[FeedItem] = []
+        self.attempts: Dict[str, int] = {}
+        self.resumed = False
+
+
+def cascade_config(feed: Dict) -> Dict:
+    """Model tiers and escalation settings of a feed (defaults are applied by the registry)."""
+    return {
+        "model_tiers": feed["model_tiers"],
+        "escalation_band": feed["escalation_band"],
+        "min_confidence": feed["min_confidence"],
+    }
+
+
+def topic_threshold(feed: Dict, topic: str) -> int:
+    """Alert threshold of one of the feed's topics."""
+    threshold = feed["subscriptions"][topic]["threshold"]
+    return RELEVANCE_THRESHOLD if threshold is None else threshold
+
+
+def archive_record(feed: Dict, item: FeedItem, score=None, reason=None, meta=None, topic=None):
+    """Row for core.archive describing one scored (or failed) item under one topic."""
+    meta = meta or {}
+    topic = topic or feed["topic"]
+    return {
+        "feed": feed["name"],
+        "topic": topic,
+        "link": item.link,
+        "title": item.title,
+        "description": item.description,
+        "pub_date": item.pub_date,
+        "score": score,
+        "reasoning": reason,
+        "model": meta.get("model"),
+        "tier": meta.get("tier"),
+        "cost_usd": sum(t["cost_usd"] for t in meta.get("tiers", [])),
+        "prompt_hash": prompt_hash(feed["subscriptions"][topic]["prompt"]),
+    }
+
+
+# ====== Scoring ======
+
+async def score_topics(text, sem, feed, topics, cascade, early_exit_max_score=None):
+    """
+    Cascade-score text for the given topics of a feed: {topic: (Evaluation, meta)}.
+    A single topic uses the (streamed) single-prompt cascade; several topics are
+    scored together in one fused call per tier; a topic whose last tier failed there
+    gets evaluation None and the error in meta["error"].
+    """
+    prompts = {topic: feed["subscriptions"][topic]["prompt"] for topic in topics}
+    if len(topics) == 1:
+        evaluation, meta = await score_with_cascade_async(
+            text, sem, prompts[topics[0]], **cascade, early_exit_max_score=early_exit_max_score
+        )
+        return {topics[0]: (evaluation, meta)}
+    evaluations, metas = await score_topics_with_cascade_async(text, sem, prompts, **cascade)
+    return {topic: (evaluations.get(topic), metas[topic]) for topic in topics}
+
+
+async def rescore_borderline_items(feed, item, results, topics, session, sem, cascade):
+    """
+    Fetch the full article for an item that is borderline for `topics` and score it again
+    with the strongest tier. Keeps the first-pass verdict of any topic that cannot be
+    rescored.
+    """
+    try:
+        article_text = await fetch_article_text(session, item.link)
+        if not article_text:
+            return results
+        full_text = f"{item.title}\n\n{item.description}\n\n{article_text}"
+        rescored = await score_topics(
+            full_text, sem, feed, topics, {**cascade, "model_tiers": cascade["model_tiers"][-1:]}
+        )
+    except Exception as e:
+        print(f"Full-text rescoring failed for {item.title}: {e}")
+        return results
+
+    for topic, (evaluation, rescore_meta) in rescored.items():
+        new_score, new_reason = extract_score_reason(evaluation)
+        if new_score is None:
+            continue
+        score, _, meta = results[topic]
+        print(f"🔁 Rescored on full text: {item.title} [{topic}] ({score} -> {new_score})")
+        rescore_meta["tiers"] = meta["tiers"] + rescore_meta["tiers"]
+        results[topic] = (new_score, new_reason, rescore_meta)
+    return results
+
+
+async def score_item(feed, item, session, sem, topics=None):
+    """
+    Cascade-score one item on its description for `topics` (default: all of the feed's),
+    then rescore it on the full article text for the topics whose score falls inside
+    the feed's rescore_band. Returns {topic: (score, reasoning, meta)}.
+    """
+    topics = topics or feed["topics"]
+    cascade = cascade_config(feed)
+    early_exit_max_score = (
+        topic_threshold(feed, topics[0]) - STREAM_EARLY_EXIT_MARGIN if STREAM_SCORING else None
+    )
+
+    scored = await score_topics(item.description, sem, feed, topics, cascade, early_exit_max_score)
+    results = {}
+    for topic, (evaluation, meta) in scored.items():
+        score, reason = extract_score_reason(evaluation)
+        results[topic] = (score, reason, meta)
+
+    rescore_band = feed.get("rescore_band")
+    borderline = [
+        topic for topic, (score, _, _) in results.items()
+        if rescore_band and score is not None and rescore_band[0] <= score <= rescore_band[1]
+    ]
+    if borderline:
+        results = await rescore_borderline_items(feed, item, results, borderline, session, sem, cascade)
+    return results
+
+
+# ====== Pipeline ======
+
+class Pipeline:
+    """Queues, workers and shared resources of one run."""
+
+    def __init__(self, session, sem, email_cfg, score_workers: int, deadline: Optional[float] = None):
+        self.session = session
+        self.sem = sem
+        self.email_cfg = email_cfg
+        self.score_workers = score_workers
+        self.deadline = deadline  # time.monotonic() value, None for no limit
+        self.fetch_q: asyncio.Queue = asyncio.Queue(maxsize=FETCH_WORKERS * 2)
+        self.parse_q: asyncio.Queue = asyncio.Queue(maxsize=RAW_QUEUE_SIZE)
+        # (priority, sequence, job): resumed items first, then newest first
+        self.score_q: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=ITEM_QUEUE_SIZE)
+        self._sequence = itertools.count()
+        self.notify_q: asyncio.Queue = asyncio.Queue(maxsize=RESULT_QUEUE_SIZE)
+        self.alerts = AlertDispatcher(email_cfg)
+        self.archive_buffer: List[Dict] = []
+        self.admitted: Set[Tuple[str, str]] = set()  # (canonical URL, topic) queued this run
+        # Feeds finish concurrently and the pending file is read-modify-written per feed
+        self.pending_lock = asyncio.Lock()
+        self.archived = 0
+        try:
+            self.dedup: Optional[DedupIndex] = DedupIndex.load()
+        except Exception as e:
+            print(f"⚠️ Story clustering disabled: {e}")
+            self.dedup = None
+        self.reuse = ScoreReuseIndex()
+
+    def time_left(self) -> Optional[float]:
+        """Seconds until the deadline (minus the margin), None without a deadline."""
+        if self.deadline is None:
+            return None
+        return self.deadline - DEADLINE_MARGIN_SECONDS - time.monotonic()
+
+    def out_of_time(self) -> bool:
+        left = self.time_left()
+        return left is not None and left <= 0
+
+    # --- Stage workers ---
+
+    async def _worker(self, queue: asyncio.Queue, handle) -> None:
+        while True:
+            job = await queue.get()
+            if isinstance(queue, asyncio.PriorityQueue):
+                job = job[-1]
+            try:
+                await handle(*job)
+            except Exception as e:
+                run = job[0]
+                print(f"❌ CRITICAL ERROR processing feed '{run.name}': {e}")
+                run.errors.append(traceback.format_exc())
+                print(run.errors[-1])
+                # Item-level jobs are checkpointed, URL-level ones hold back that URL's last run time
+                if isinstance(job[1], FeedItem):
+                    run.unfinished.append(job[1])
+                else:
+                    run.incomplete.add(job[1])
+                await self._done(run)
+            finally:
+                queue.task_done()
+
+    async def _fetch(self, run: FeedRun, url: str) -> None:
+        if self.out_of_time():
+            print(f"⏰ Deadline reached, not fetching {url}")
+            run.incomplete.add(url)
+            await self._done(run)
+            return
+        try:
+            # Retries and backoff inside the fetch must not run past the deadline either
+            raw = await asyncio.wait_for(fetch_feed_content(self.session, url), timeout=self.time_left())
+        except asyncio.TimeoutError as e:
+            # The last retry of fetch_url can also time out on its own
+            print(f"⏰ Deadline reached while fetching {url}" if self.out_of_time()
+                  else f"❌ Fetch error in {run.name}: {e!r}")
+            run.incomplete.add(url)
+            await self._done(run)
+            return
+        except Exception as e:
+            print(f"❌ Fetch error in {run.name}: {e}")
+            run.incomplete.add(url)
+            await self._done(run)
+            return
+        await self.parse_q.put((run, url, raw))
+
+    async def _parse(self, run: FeedRun, url: str, raw: bytes) -> None:
+        try:
+            # Parsing is CPU-bound: keep it off the event loop so fetches and LLM calls continue
+            items = await asyncio.to_thread(run.feed["postprocess_fn"], raw, run.name)
+        except Exception as e:
+            print(f"❌ Postprocessing error for {run.name}: {e}")
+            run.incomplete.add(url)
+            await self._done(run)
+            return
+        del raw
+
+        last_run = run.url_last_run[url]
+        new_items = [
+            it for it in items
+            if it.pub_date is not None
+            and (last_run is None or it.pub_date > last_run)
+        ]
+        if new_items:
+            print(f"🆕 {len(new_items)} new items from {run.name}")
+        run.new_items += len(new_items)
+        await self._admit(run, new_items)
+        await self._done(run)
+
+    async def _admit(self, run: FeedRun, items: List[FeedItem], resumed: bool = False) -> None:
+        """
+        Queue items for scoring under the topics they still need: topics already scored in
+        the archive (e.g. by a run that did not advance the last run time) are skipped.
+        """
+        try:
+            done = await asyncio.to_thread(scored_topics, [it.link for it in items], run.feed["topics"])
+        except Exception as e:
+            print(f"⚠️ Could not check the archive for already scored items: {e}")
+            done = set()
+
+        # Only the first item of each story is scored per topic; other outlets' copies
+        # join its cluster. clusters maps each topic the item is scored for to its cluster.
+        to_score = []
+        for item in items:
+            clusters = {}
+            canonical = canonicalize_url(item.link)
+            for topic in run.feed["topics"]:
+                if (canonical, topic) in done:
+                    continue
+                # The same article listed under several of a feed's URLs is scored once
+                if (canonical, topic) in self.admitted and not resumed:
+                    print(f"🔗 Already queued: {item.title} [{topic}]")
+                    continue
+                self.admitted.add((canonical, topic))
+                cluster, is_rep = self.dedup.assign(item, topic, resumed) if self.dedup else (None, True)
+                if is_rep:
+                    clusters[topic] = cluster
+                    continue
+                print(f"🔗 Duplicate story: {item.title} (see {cluster.rep_link})")
+                self.archive_buffer.append(archive_record(
+                    run.feed, item, cluster.score, f"Duplicate of {cluster.rep_link}", None, topic
+                ))
+            if clusters:
+                to_score.append((item, clusters))
+        if len(self.archive_buffer) >= ARCHIVE_FLUSH_SIZE:
+            await self.flush_archive()
+
+        run.pending += len(to_score)
+        for item, clusters in to_score:
+            newest_first = -item.pub_date.timestamp() if item.pub_date else 0.0
+            priority = (0 if resumed else 1, self._likelihood_rank(run, item, clusters), newest_first)
+            await self.score_q.put((priority, next(self._sequence), (run, item, clusters)))
+
+    def _likelihood_rank(self, run: FeedRun, item: FeedItem, clusters: Dict) -> int:
+        """0 if similar past items were relevant for any topic, 2 if all were not, else 1."""
+        if not SCORE_REUSE:
+            return 1
+        text = f"{item.title} {item.description}"
+        estimates = {topic: self.reuse.estimate(run.reuse_keys[topic], text) for topic in clusters}
+        if any(e is not None and e > topic_threshold(run.feed, t) for t, e in estimates.items()):
+            return 0
+        if estimates and all(e is not None for e in estimates.values()):
+            return 2
+        return 1
+
+    async def _resume(self, run: FeedRun) -> None:
+        """Queue the items checkpointed for this feed by earlier runs ahead of new work."""
+        try:
+            entries = await asyncio.to_thread(load_pending_items, run.name)
+        except Exception as e:
+            print(f"⚠️ Could not load pending items of {run.name}: {e}")
+            return
+        run.resumed = bool(entries)
+        items = []
+        for entry in entries:
+            item = FeedItem.from_json(entry["item"])
+            run.attempts[item.link] = entry.get("attempts", 1)
+            items.append(item)
+        if items:
+            print(f"⏳ Resuming {len(items)} checkpointed items of {run.name}")
+            await self._admit(run, items, resumed=True)
+
+    async def _score(self, run: FeedRun, item: FeedItem, clusters: Dict) -> None:
+        text = f"{item.title} {item.description}"
+        band = run.feed["escalation_band"]
+        results: Dict[str, tuple] = {}
+        audits: Dict[str, int] = {}
+        llm_topics = []
+        for topic in clusters:
+            predicted = self.reuse.predict(run.reuse_keys[topic], text, band) if SCORE_REUSE else None
+            if predicted is None:
+                llm_topics.append(topic)
+            elif should_audit():
+                audits[topic] = predicted["score"]
+                llm_topics.append(topic)
+            else:
+                REUSE_STATS["reused"] += 1
+                reason = (f"Score reused from {predicted['neighbours']} similar item(s), nearest "
+                          f"{predicted['link']} (similarity {predicted['similarity']:.2f})")
+                results[topic] = (
+                    predicted["score"], reason, {"tier": "reuse", "model": predicted["model"], "tiers": []}
+                )
+
+        if llm_topics and self.out_of_time():
+            run.unfinished.append(item)
+            llm_topics = []
+        elif llm_topics:
+            try:
+                results.update(await asyncio.wait_for(
+                    score_item(run.feed, item, self.session, self.sem, llm_topics),
+                    timeout=self.time_left(),
+                ))
+                # Topics final at a lower tier are kept; the next run rescores only the failed ones
+                failed = [topic for topic in llm_topics if results[topic][2].get("error")]
+                if failed:
+                    print(f"Error analyzing {item.title} for {', '.join(failed)}; checkpointed")
+                    run.unfinished.append(item)
+            except asyncio.TimeoutError:
+                print(f"⏰ Deadline reached while scoring {item.title}; checkpointed")
+                run.unfinished.append(item)
+                llm_topics = []
+            except Exception as e:
+                print(f"Error analyzing {item.title}: {e}")
+                run.unfinished.append(item)
+                results.update({topic: (None, None, None) for topic in llm_topics})
+            for topic in llm_topics:
+                score, _, meta = results[topic]
+                if topic in audits:
+                    record_audit(audits[topic], score)
+                # Only confident verdicts (outside the ambiguous band) become reusable neighbours
+                if score is not None and not band[0] <= score <= band[1]:
+                    self.reuse.add(run.reuse_keys[topic], text, score, item.link, meta["model"])
+        await self.notify_q.put((run, item, clusters, results))
+
+    async def _notify(self, run: FeedRun, item: FeedItem, clusters: Dict, results: Dict) -> None:
+        for topic, (score, reason, meta) in results.items():
+            self.archive_buffer.append(archive_record(run.feed, item, score, reason, meta, topic))
+            cluster = clusters[topic]
+            if cluster is not None and score is not None:
+                cluster.score = score
+                cluster.dirty = True
+
+            if score and score > topic_threshold(run.feed, topic):
+                print(f"✅ Relevant: {item.title} ({topic}: {score}, {meta['tier']})")
+                run.relevant += 1
+                self.alerts.add(run.feed, topic, (item, score, reason, meta, cluster))
+        if len(self.archive_buffer) >= ARCHIVE_FLUSH_SIZE:
+            await self.flush_archive()
+        await self._done(run)
+
+    # --- Feed completion ---
+
+    async def _done(self, run: FeedRun) -> None:
+        """Mark one unit of a feed's work complete and finalize the feed at zero."""
+        run.pending -= 1
+        if run.pending == 0:
+            await self._finalize(run)
+
+    async def _finalize(self, run: FeedRun) -> None:
+        """Flush the feed's alerts, email any error report and save the feed's last run time."""
+        name = run.name
+        if not run.new_items:
+            print(f"No new items in {name}.")
+
+        # Alerts went out while scoring; send whatever is still waiting in a window
+        await self.alerts.flush_feed(name)
+
+        if run.errors:
+            try:
+                await asyncio.to_thread(
+                    send_email,
+                    subject=f"CRITICAL ERROR in News Reporter: Failed to process '{name}'",
+                    body=f"The news reporter failed to process the '{name}' feed.\n\nError:\n"
+                         + "\n".join(run.errors),
+                    **self.email_cfg,
+                )
+            except Exception as mail_e:
+                print(f"❌ Additionally, failed to send error email: {mail_e}")
+
+        # --- Checkpoint unfinished items, then advance the last run time over completed work ---
+        checkpointed = await self._checkpoint(run)
+        if not checkpointed:
+            print(f"⚠️ Keeping last run time for {name}: unfinished items were not checkpointed\n")
+            return
+        # Each URL advances on its own, so one failing URL does not hold back (and, once the
+        # archive is gone, re-alert) the items of the others
+        for url in run.feed["urls"]:
+            if url not in run.incomplete:
+                save_last_run_time(url_state_key(name, url), run.start_time)
+        if run.incomplete:
+            print(f"⚠️ Keeping last run time for {len(run.incomplete)} feed URL(s) of {name} not processed\n")
+            return
+        save_last_run_time(name, run.start_time)
+        print(f"✅ Updated last run time for {name} to {run.start_time.strftime('%a, %d %b %Y %H:%M:%S GMT')}\n")
+
+    async def _checkpoint(self, run: FeedRun) -> bool:
+        """Persist the feed's unfinished items (replacing earlier ones). True on success."""
+        if not run.unfinished and not run.resumed:
+            return True
+        entries = []
+        for item in run.unfinished:
+            attempts = run.attempts.get(item.link, 0) + 1
+            if attempts > MAX_PENDING_ATTEMPTS:
+                print(f"🗑️ Dropping {item.title} after {MAX_PENDING_ATTEMPTS} unsuccessful runs")
+                continue
+            entries.append({"item": item.to_json(), "attempts": attempts})
+        try:
+            async with self.pending_lock:
+                await asyncio.to_thread(save_pending_items, run.name, entries)
+        except Exception as e:
+            print(f"❌ Checkpointing {len(entries)} items of {run.name} failed: {e}")
+            return False
+        if entries:
+            print(f"💾 Checkpointed {len(entries)} unfinished items of {run.name}")
+        return True
+
+    async def flush_archive(self) -> None:
+        rows, self.archive_buffer = self.archive_buffer, []
+        if not rows:
+            return
+        try:
+            self.archived += await asyncio.to_thread(archive_items, rows)
+        except Exception as e:
+            print(f"❌ Archiving failed: {e}")
+
+    # --- Driver ---
+
+    async def run(self, feeds: List[Dict]) -> None:
+        stages = [
+            (self.fetch_q, self._fetch, FETCH_WORKERS),
+            (self.parse_q, self._parse, PARSE_WORKERS),
+            (self.score_q, self._score, self.score_workers),
+            (self.notify_q, self._notify, NOTIFY_WORKERS),
+        ]
+        workers = [
+            asyncio.create_task(self._worker(queue, handle))
+            for queue, handle, count in stages
+            for _ in range(count)
+        ]
+
+        if SCORE_REUSE:
+            # Feeds sharing a topic prompt may use different bands: exclude all of them
+            bands: Dict[Tuple[str, str], Tuple[int, int]] = {}
+            for f in feeds:
+                low, high = f["escalation_band"]
+                for topic, sub in f["subscriptions"].items():
+                    key = (topic, prompt_hash(sub["prompt"]))
+                    known = bands.get(key, (low, high))
+                    bands[key] = (min(low, known[0]), max(high, known[1]))
+            try:
+                loaded = await asyncio.to_thread(self.reuse.load, bands)
+                print(f"♻️ Loaded {loaded} past verdicts for score reuse")
+            except Exception as e:
+                print(f"⚠️ Could not load past verdicts for score reuse: {e}")
+
+        try:
+            for feed in feeds:
+                run = start_feed_run(feed)
+                if run is None:
+                    continue
+                await self._resume(run)
+                for url in feed["urls"]:
+                    await self.fetch_q.put((run, url))
+
+            # Drain stage by stage: once a queue is joined nothing new can reach the next one
+            for queue, _, _ in stages:
+                await queue.join()
+                if queue is self.parse_q:
+                    # Every item is admitted, so story clusters have all of this run's links
+                    self.alerts.settle()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self.alerts.close()
+            await self.flush_archive()
+            await self.save_clusters()
+
+    async def save_clusters(self) -> None:
+        if self.dedup is None:
+            return
+        try:
+            await asyncio.to_thread(self.dedup.save)
+        except Exception as e:
+            print(f"❌ Saving story clusters failed: {e}")
+            return
+        if self.dedup.duplicates:
+            print(f"🔗 Skipped scoring {self.dedup.duplicates} duplicate stories")
+
+
+def url_state_key(feed_name: str, url: str) -> str:
+    """State key of one feed URL's last run time."""
+    return f"{feed_name} | {url}"
+
+
+def start_feed_run(feed: Dict) -> Optional[FeedRun]:
+    """Check the feed's schedule and load its last run time; None if it should be skipped."""
+    name = feed["name"]
+    start_time = datetime.now(timezone.utc)  # Consistent timestamp for this run
+    last_run = load_last_run_time(name)
+
+    # --- Respect the feed's schedule before touching its timestamp ---
+    min_interval = feed.get("schedule", {}).get("min_interval_minutes", 0)
+    if min_interval and last_run and start_time - last_run < timedelta(minutes=min_interval):
+        print(f"⏭️ Skipping {name}: last run less than {min_interval} minutes ago")
+        return None
+
+    print(f"\n📡 Processing feed: {name}")
+    if last_run:
+        print(f"Last run for {name}: {last_run.strftime('%a, %d %b %Y %H:%M:%S GMT')}")
+    else:
+        print(f"First run for {name} (no previous timestamp found)")
+    url_last_run = {url: load_last_run_time(url_state_key(name, url)) or last_run for url in feed["urls"]}
+    return FeedRun(feed, last_run, start_time, url_last_run)
+
+
+async def run_pipeline(feeds, session, sem, email_cfg, score_workers: int, deadline: Optional[float] = None) -> int:
+    """
+    Run all feeds through the staged pipeline, stopping new work near `deadline`
+    (a time.monotonic() value). Returns the number of archived items.
+    """
+    pipeline = Pipeline(session, sem, email_cfg, score_workers, deadline)
+    await pipeline.run(feeds)
+    return pipeline.archived
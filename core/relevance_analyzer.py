@@ -1,23 +1,256 @@
 # core/relevance_analyzer.py
 import asyncio
-from llm_call import chat_completion_async
+from typing import Dict, List, Optional, Tuple
+from llm_call import chat_completion_async, Evaluation
 
-async def analyze_relevance_async(description: str, sem: asyncio.Semaphore, base_prompt: str):
-    """
-    Analyze relevance of a feed item using the provided LLM prompt.
-    Each feed can have its own unique base_prompt.
-    """
+# Per-tier totals for this process: calls, final verdicts, latency and cost
+CASCADE_STATS: Dict[str, Dict[str, float]] = {}
+
+
+def build_relevance_messages(
+    description: str,
+    base_prompt: str,
+    score_only: bool = False,
+    with_confidence: bool = False,
+) -> List[Dict[str, str]]:
+    """Chat messages asking for a JSON score (and confidence/reasoning) for one item."""
     question = f"{base_prompt}\n\nTEXT:\n{description}"
 
-    chat_history = [
+    fields = ['"score": <integer>']
+    if with_confidence:
+        fields.append('"confidence": <integer 1-10, how sure you are of the score>')
+    if not score_only:
+        fields.append('"reasoning": "<short text>"')
+    schema_hint = f"Respond only with a JSON object: {{{', '.join(fields)}}}."
+
+    return [
+        {
+            "role": "system",
+            "content": f"You are a precise and concise news analyst. {schema_hint}",
+        },
+        {"role": "user", "content": question},
+    ]
+
+
+def build_topics_messages(
+    description: str,
+    topic_prompts: Dict[str, str],
+    with_confidence: bool = False,
+) -> List[Dict[str, str]]:
+    """Chat messages asking for one JSON evaluation per topic key in a single response."""
+    topic_lines = "\n".join(f"- {key}: {prompt}" for key, prompt in topic_prompts.items())
+    question = (
+        f"Score the text separately for each of these topics:\n{topic_lines}\n\nTEXT:\n{description}"
+    )
+
+    fields = ['"score": <integer>']
+    if with_confidence:
+        fields.append('"confidence": <integer 1-10, how sure you are of the score>')
+    fields.append('"reasoning": "<short text>"')
+    schema_hint = (
+        f'Respond only with a JSON object: {{"evaluations": {{"<topic key>": {{{", ".join(fields)}}}}}}} '
+        f"with an entry for every topic key."
+    )
+
+    return [
         {
             "role": "system",
-            "content": "You are a precise and concise news analyst. Output must conform to the schema: score (integer), reasoning (text).",
+            "content": f"You are a precise and concise news analyst. {schema_hint}",
         },
         {"role": "user", "content": question},
     ]
 
+
+async def analyze_relevance_async(
+    description: str,
+    sem: asyncio.Semaphore,
+    base_prompt: str,
+    score_only: bool = False,
+    usage_out: Optional[Dict] = None,
+    early_exit_max_score: Optional[int] = None,
+    model: Optional[str] = None,
+    with_confidence: bool = False,
+):
+    """
+    Analyze relevance of a feed item using the provided LLM prompt.
+    Each feed can have its own unique base_prompt.
+    With score_only=True the model is asked for the integer score alone (reasoning is "").
+    With early_exit_max_score the response is streamed and cut off once the score is
+    known to be at or below it, so reasoning is only generated for likely alerts.
+    """
+    chat_history = build_relevance_messages(description, base_prompt, score_only, with_confidence)
+
     async with sem:
         return await chat_completion_async(
-            chat_history=chat_history, temperature=0.2, use_structured=True
+            chat_history=chat_history,
+            temperature=0.2,
+            use_structured=True,
+            score_only=score_only,
+            usage_out=usage_out,
+            early_exit_max_score=early_exit_max_score,
+            model=model,
+            with_confidence=with_confidence,
         )
+
+
+def _record_tier_call(tier: Dict, usage: Dict, score: Optional[int]) -> Dict:
+    """Cost one call from the tier's per-million-token prices and add it to CASCADE_STATS."""
+    prompt_tokens = usage.get("prompt_tokens", 0)
+    completion_tokens = usage.get("completion_tokens", 0)
+    cost = (
+        prompt_tokens * tier.get("input_cost_per_mtok", 0.0)
+        + completion_tokens * tier.get("output_cost_per_mtok", 0.0)
+    ) / 1_000_000
+
+    stats = CASCADE_STATS.setdefault(
+        tier["name"], {"calls": 0, "final": 0, "latency_seconds": 0.0, "cost_usd": 0.0}
+    )
+    stats["calls"] += 1
+    stats["latency_seconds"] += usage.get("latency_seconds", 0.0)
+    stats["cost_usd"] += cost
+
+    return {
+        "tier": tier["name"],
+        "model": tier["model"],
+        "score": score,
+        "latency_seconds": usage.get("latency_seconds", 0.0),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": cost,
+    }
+
+
+async def score_with_cascade_async(
+    description: str,
+    sem: asyncio.Semaphore,
+    base_prompt: str,
+    model_tiers: List[Dict],
+    escalation_band: Tuple[int, int],
+    min_confidence: int,
+    early_exit_max_score: Optional[int] = None,
+) -> Tuple[Evaluation, Dict]:
+    """
+    Score with the cheapest tier first and escalate to the next tier only when the
+    score falls inside escalation_band (inclusive), the self-reported confidence is
+    below min_confidence, or the cheaper tier fails.
+    Returns the final Evaluation and a metadata dict:
+        {"tier": ..., "model": ..., "tiers": [per-call latency/tokens/cost]}
+    """
+    low, high = escalation_band
+    meta: Dict = {"tier": None, "model": None, "tiers": []}
+    result: Optional[Evaluation] = None
+
+    for i, tier in enumerate(model_tiers):
+        is_last = i == len(model_tiers) - 1
+        usage: Dict = {}
+        try:
+            result = await analyze_relevance_async(
+                description,
+                sem,
+                base_prompt,
+                usage_out=usage,
+                early_exit_max_score=early_exit_max_score,
+                model=tier["model"],
+                with_confidence=not is_last,
+            )
+        except Exception as e:
+            meta["tiers"].append(_record_tier_call(tier, usage, None))
+            if is_last:
+                raise
+            print(f"⚠️ Tier '{tier['name']}' failed, escalating: {e}")
+            continue
+
+        meta["tiers"].append(_record_tier_call(tier, usage, result.score))
+        meta["tier"], meta["model"] = tier["name"], tier["model"]
+        if is_last:
+            break
+
+        ambiguous = low <= result.score <= high
+        unsure = result.confidence is not None and result.confidence < min_confidence
+        if not ambiguous and not unsure:
+            break
+
+    CASCADE_STATS[meta["tier"]]["final"] += 1
+    return result, meta
+
+
+async def score_topics_with_cascade_async(
+    description: str,
+    sem: asyncio.Semaphore,
+    topic_prompts: Dict[str, str],
+    model_tiers: List[Dict],
+    escalation_band: Tuple[int, int],
+    min_confidence: int,
+) -> Tuple[Dict[str, Evaluation], Dict[str, Dict]]:
+    """
+    Fused variant of score_with_cascade_async: every topic is scored in one call per
+    tier, and only the topics that are ambiguous or unsure move up to the next tier.
+    Returns ({topic: Evaluation}, {topic: meta}); a call's tokens and cost are split
+    evenly across the topics it scored. If the last tier fails, the topics already final
+    keep their verdicts and the escalated ones are left out of the results with the
+    error in their meta; the call raises only when no topic was final.
+    """
+    low, high = escalation_band
+    results: Dict[str, Evaluation] = {}
+    metas: Dict[str, Dict] = {key: {"tier": None, "model": None, "tiers": []} for key in topic_prompts}
+    remaining = list(topic_prompts)
+
+    for i, tier in enumerate(model_tiers):
+        is_last = i == len(model_tiers) - 1
+        usage: Dict = {}
+        messages = build_topics_messages(
+            description, {key: topic_prompts[key] for key in remaining}, with_confidence=not is_last
+        )
+        try:
+            async with sem:
+                evaluations = await chat_completion_async(
+                    chat_history=messages,
+                    temperature=0.2,
+                    use_structured=True,
+                    usage_out=usage,
+                    model=tier["model"],
+                    with_confidence=not is_last,
+                    topics=remaining,
+                )
+        except Exception as e:
+            call = _record_tier_call(tier, usage, None)
+            for key in remaining:
+                metas[key]["tiers"].append(_split_call(call, len(remaining)))
+            if is_last:
+                if len(remaining) == len(topic_prompts):
+                    raise
+                print(f"⚠️ Tier '{tier['name']}' failed for {', '.join(remaining)}: {e}")
+                for key in remaining:
+                    results.pop(key, None)
+                    metas[key]["error"] = str(e)
+                break
+            print(f"⚠️ Tier '{tier['name']}' failed, escalating: {e}")
+            continue
+
+        call = _record_tier_call(tier, usage, None)
+        escalate = []
+        for key in remaining:
+            result = evaluations[key]
+            results[key] = result
+            metas[key]["tiers"].append({**_split_call(call, len(remaining)), "score": result.score})
+            metas[key]["tier"], metas[key]["model"] = tier["name"], tier["model"]
+            ambiguous = low <= result.score <= high
+            unsure = result.confidence is not None and result.confidence < min_confidence
+            if not is_last and (ambiguous or unsure):
+                escalate.append(key)
+        CASCADE_STATS[tier["name"]]["final"] += len(remaining) - len(escalate)
+        remaining = escalate
+        if not remaining:
+            break
+
+    return results, metas
+
+
+def _split_call(call: Dict, parts: int) -> Dict:
+    """One topic's share of a fused call's tokens and cost."""
+    return {
+        **call,
+        "prompt_tokens": call["prompt_tokens"] / parts,
+        "completion_tokens": call["completion_tokens"] / parts,
+        "cost_usd": call["cost_usd"] / parts,
+    }
@@ -1,5 +1,163 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
 import aiohttp
 
+try:  # aiohttp decodes br only when a brotli package is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# ====== Configuration ======
+FETCH_CONNECTIONS = 64               # total open connections
+FETCH_PER_HOST_CONNECTIONS = 4       # connection pool size per host
+FETCH_MIN_INTERVAL_SECONDS = 0.25    # politeness gap between request starts to one host
+FETCH_MAX_RETRIES = 3
+FETCH_BACKOFF_SECONDS = 1.0          # base for exponential backoff with full jitter
+FETCH_MAX_BACKOFF_SECONDS = 20.0
+FETCH_MAX_BYTES = 10 * 1024 * 1024   # hard cap on the decompressed body
+FETCH_CHUNK_BYTES = 64 * 1024
+DNS_CACHE_TTL_SECONDS = 300
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10, sock_read=15)
+USER_AGENT = "news-analyzer-llm/1.0 (+rss reader)"
+
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Per-host request/latency/failure statistics for this process, see host_stats_summary()
+HOST_STATS: Dict[str, Dict] = {}
+
+_host_slots: Dict[str, Dict] = {}
+_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a response body exceeds its byte cap."""
+
+
+class TransientHTTPError(Exception):
+    """Retryable HTTP status (429/5xx), carrying any Retry-After delay."""
+
+    def __init__(self, status: int, url: str, retry_after: Optional[float]):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Shared session: bounded per-host pools, DNS cache and compression negotiated."""
+    connector = aiohttp.TCPConnector(
+        limit=FETCH_CONNECTIONS,
+        limit_per_host=FETCH_PER_HOST_CONNECTIONS,
+        ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+        use_dns_cache=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=FETCH_TIMEOUT,
+        headers={"Accept-Encoding": ACCEPT_ENCODING, "User-Agent": USER_AGENT},
+    )
+
+
+def _host_slot(host: str) -> Dict:
+    """Per-host lock and last-request time, reset whenever a new event loop is running."""
+    global _slots_loop
+    loop = asyncio.get_running_loop()
+    if loop is not _slots_loop:
+        _host_slots.clear()
+        _slots_loop = loop
+    if host not in _host_slots:
+        _host_slots[host] = {"lock": asyncio.Lock(), "last_start": 0.0}
+    return _host_slots[host]
+
+
+async def _wait_politely(host: str) -> None:
+    """Space out request starts to the same host by FETCH_MIN_INTERVAL_SECONDS."""
+    slot = _host_slot(host)
+    async with slot["lock"]:
+        wait = slot["last_start"] + FETCH_MIN_INTERVAL_SECONDS - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        slot["last_start"] = time.monotonic()
+
+
+def _host_stats(host: str) -> Dict:
+    return HOST_STATS.setdefault(
+        host, {"requests": 0, "failures": 0, "retries": 0, "bytes": 0, "latencies": []}
+    )
+
+
+def _retry_after(resp: aiohttp.ClientResponse) -> Optional[float]:
+    value = resp.headers.get("Retry-After", "")
+    return float(value) if value.isdigit() else None
+
+
+async def _read_capped(resp: aiohttp.ClientResponse, url: str, max_bytes: int) -> bytes:
+    """Stream the (transparently decompressed) body, aborting once it exceeds max_bytes."""
+    declared = resp.content_length
+    if declared is not None and declared > max_bytes:
+        raise ResponseTooLarge(f"{url} declares {declared} bytes (cap {max_bytes})")
+
+    chunks: List[bytes] = []
+    size = 0
+    async for chunk in resp.content.iter_chunked(FETCH_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise ResponseTooLarge(f"{url} exceeded {max_bytes} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def fetch_url(
+    session: aiohttp.ClientSession,
+    url: str,
+    max_bytes: int = FETCH_MAX_BYTES,
+    max_retries: int = FETCH_MAX_RETRIES,
+) -> bytes:
+    """
+    GET a URL politely: per-host spacing, retries with jittered exponential backoff on
+    connection errors, timeouts and 429/5xx (honouring Retry-After), and a hard cap on
+    the decompressed body size. Latency and failures are recorded in HOST_STATS.
+    """
+    host = urlsplit(url).netloc.lower()
+    stats = _host_stats(host)
+
+    for attempt in range(max_retries + 1):
+        await _wait_politely(host)
+        started = time.perf_counter()
+        stats["requests"] += 1
+        try:
+            async with session.get(url) as resp:
+                if resp.status in TRANSIENT_STATUSES:
+                    raise TransientHTTPError(resp.status, url, _retry_after(resp))
+                resp.raise_for_status()
+                body = await _read_capped(resp, url, max_bytes)
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                asyncio.TimeoutError, TransientHTTPError) as e:
+            stats["failures"] += 1
+            if attempt >= max_retries:
+                raise
+            delay = random.uniform(0, min(FETCH_MAX_BACKOFF_SECONDS, FETCH_BACKOFF_SECONDS * 2 ** attempt))
+            if isinstance(e, TransientHTTPError) and e.retry_after is not None:
+                delay = min(e.retry_after, FETCH_MAX_BACKOFF_SECONDS)
+            stats["retries"] += 1
+            print(f"⚠️ Fetch attempt {attempt + 1} failed for {url}: {e!r}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+        except Exception:
+            stats["failures"] += 1
+            raise
+
+        stats["latencies"].append(time.perf_counter() - started)
+        stats["bytes"] += len(body)
+        return body
+
+    raise RuntimeError(f"Fetch failed unexpectedly for {url}")
+
+
 async def fetch_feed_content(session: aiohttp.ClientSession, url: str) -> bytes:
     """
     Fetch raw feed content from the given URL.
@@ -7,6 +165,24 @@ async def fetch_feed_content(session: aiohttp.ClientSession, url: str) -> bytes:
     It could be RSS, Atom, JSON Feed, or custom XML/HTML.
     """
     print(f"Fetching: {url}")
-    async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-        resp.raise_for_status()
-        return await resp.read()
+    return await fetch_url(session, url)
+
+
+def host_stats_summary() -> Dict[str, Dict]:
+    """Per-host request counts, failure rate and latency percentiles (seconds)."""
+    summary = {}
+    for host, stats in HOST_STATS.items():
+        latencies = sorted(stats["latencies"])
+
+        def pct(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+
+        summary[host] = {
+            "requests": stats["requests"],
+            "failures": stats["failures"],
+            "retries": stats["retries"],
+            "bytes": stats["bytes"],
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+        }
+    return summary
@@ -0,0 +1,227 @@
+"""
+Score reuse from a local nearest-neighbour index of past verdicts.
+
+Items are embedded as hashed TF-IDF vectors (unigrams + bigrams of content words) and
+kept per (topic, prompt hash) in a bounded index with an inverted file over features.
+When a new item lies within REUSE_MIN_SIMILARITY of confidently scored neighbours that
+agree with each other, their similarity-weighted score is reused instead of calling
+the LLM. A sample of reuse decisions is still scored by the LLM to measure disagreement.
+"""
+import math
+import random
+import re
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from core.archive import ARCHIVE_PATH, connect
+from core.dedup import shingles
+
+# ====== Configuration ======
+REUSE_MAX_ITEMS = 5000         # verdicts kept per topic; oldest are evicted first
+REUSE_MIN_SIMILARITY = 0.80    # cosine radius for a neighbour to count
+REUSE_NEIGHBOURS = 5           # at most this many neighbours are interpolated
+REUSE_MAX_SPREAD = 2           # neighbours must agree within this many points
+REUSE_AUDIT_RATE = 0.05        # share of reuse decisions re-scored by the LLM anyway
+REUSE_AUDIT_TOLERANCE = 1      # audit counts as a disagreement beyond this difference
+FEATURE_BITS = 20
+QUERY_FEATURES = 12            # highest-weight features used to gather candidates
+MAX_CANDIDATES = 200
+PRIORITY_MIN_SIMILARITY = 0.30  # looser radius for the scheduling estimate, see estimate()
+
+# Totals for this process: lookups, reused, audited, disagreements
+REUSE_STATS: Dict[str, int] = {"lookups": 0, "reused": 0, "audited": 0, "disagreements": 0}
+
+_MASK = (1 << FEATURE_BITS) - 1
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+Vector = Dict[int, float]
+
+
+def term_counts(text: str) -> Dict[int, int]:
+    """Hashed unigram and bigram counts of the content words in text, in order."""
+    vocabulary = shingles(text)
+    words = [w for w in _WORD.findall(text.lower()) if w in vocabulary]
+    counts: Dict[int, int] = {}
+    for i, word in enumerate(words):
+        features = (word, f"{words[i - 1]} {word}") if i else (word,)
+        for feature in features:
+            h = zlib.crc32(feature.encode("utf-8")) & _MASK
+            counts[h] = counts.get(h, 0) + 1
+    return counts
+
+
+def cosine(a: Vector, b: Vector) -> float:
+    """Dot product of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(f, 0.0) for f, w in a.items())
+
+
+class _TopicIndex:
+    """Bounded FIFO of verdict vectors plus an inverted file and document frequencies."""
+
+    __slots__ = ("entries", "postings", "df", "next_id")
+
+    def __init__(self):
+        self.entries: "OrderedDict[int, Tuple[Vector, int, str, Optional[str]]]" = OrderedDict()
+        self.postings: Dict[int, set] = {}
+        self.df: Dict[int, int] = {}
+        self.next_id = 0
+
+    def vectorize(self, counts: Dict[int, int]) -> Vector:
+        """Sublinear TF x smoothed IDF, L2-normalized."""
+        n = len(self.entries)
+        weights = {
+            f: (1.0 + math.log(c)) * (math.log((n + 1) / (self.df.get(f, 0) + 1)) + 1.0)
+            for f, c in counts.items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {f: w / norm for f, w in weights.items()}
+
+    def add(self, counts: Dict[int, int], score: int, link: str, model: Optional[str]) -> None:
+        vector = self.vectorize(counts)
+        entry_id = self.next_id
+        self.next_id += 1
+        self.entries[entry_id] = (vector, score, link, model)
+        for f in vector:
+            self.postings.setdefault(f, set()).add(entry_id)
+            self.df[f] = self.df.get(f, 0) + 1
+        while len(self.entries) > REUSE_MAX_ITEMS:
+            self._evict()
+
+    def _evict(self) -> None:
+        entry_id, (vector, _, _, _) = self.entries.popitem(last=False)
+        for f in vector:
+            posting = self.postings[f]
+            posting.discard(entry_id)
+            if not posting:
+                del self.postings[f]
+            self.df[f] -= 1
+            if not self.df[f]:
+                del self.df[f]
+
+    def neighbours(
+        self, counts: Dict[int, int], min_similarity: float = REUSE_MIN_SIMILARITY
+    ) -> List[Tuple[float, int, str, Optional[str]]]:
+        """(similarity, score, link, model) of entries within min_similarity, nearest first."""
+        query = self.vectorize(counts)
+        top = sorted(query, key=query.get, reverse=True)[:QUERY_FEATURES]
+        hits: Dict[int, int] = {}
+        for f in top:
+            for entry_id in self.postings.get(f, ()):
+                hits[entry_id] = hits.get(entry_id, 0) + 1
+        candidates = sorted(hits, key=hits.get, reverse=True)[:MAX_CANDIDATES]
+
+        found = []
+        for entry_id in candidates:
+            vector, score, link, model = self.entries[entry_id]
+            sim = cosine(query, vector)
+            if sim >= min_similarity:
+                found.append((sim, score, link, model))
+        found.sort(key=lambda n: n[0], reverse=True)
+        return found[:REUSE_NEIGHBOURS]
+
+
+class ScoreReuseIndex:
+    """Per-(topic, prompt hash) nearest-neighbour indexes of confident verdicts."""
+
+    def __init__(self):
+        self.topics: Dict[Tuple[str, str], _TopicIndex] = {}
+
+    def _topic(self, key: Tuple[str, str]) -> _TopicIndex:
+        if key not in self.topics:
+            self.topics[key] = _TopicIndex()
+        return self.topics[key]
+
+    def load(self, bands: Dict[Tuple[str, str], Tuple[int, int]], path: str = ARCHIVE_PATH) -> int:
+        """
+        Rebuild the index of each (topic, prompt hash) key in `bands` from the newest
+        LLM-scored archive rows. Rows that were reused, deduplicated, scored with another
+        prompt or scored inside the key's escalation band (ambiguous) are skipped.
+        """
+        conn = connect(path)
+        loaded = 0
+        try:
+            for (topic, p_hash), (low, high) in bands.items():
+                rows = conn.execute(
+                    "SELECT title, description, link, score, model FROM items "
+                    "WHERE topic = ? AND prompt_hash = ? AND score IS NOT NULL "
+                    "AND (score < ? OR score > ?) "
+                    "AND tier IS NOT NULL AND tier != 'reuse' "
+                    "ORDER BY scored_at DESC LIMIT ?",
+                    (topic, p_hash, low, high, REUSE_MAX_ITEMS),
+                ).fetchall()
+                index = self._topic((topic, p_hash))
+                for row in reversed(rows):
+                    counts = term_counts(f"{row['title']} {row['description']}")
+                    if counts:
+                        index.add(counts, row["score"], row["link"], row["model"])
+                        loaded += 1
+        finally:
+            conn.close()
+        return loaded
+
+    def predict(
+        self, key: Tuple[str, str], text: str, band: Optional[Tuple[int, int]] = None
+    ) -> Optional[Dict]:
+        """
+        Interpolated score from close, mutually agreeing neighbours, or None.
+        Predictions inside `band` (the cascade's ambiguous range) are not returned.
+        """
+        REUSE_STATS["lookups"] += 1
+        index = self.topics.get(key)
+        counts = term_counts(text)
+        if index is None or not index.entries or not counts:
+            return None
+        found = index.neighbours(counts)
+        if not found:
+            return None
+        scores = [score for _, score, _, _ in found]
+        if max(scores) - min(scores) > REUSE_MAX_SPREAD:
+            return None
+
+        weight = sum(sim for sim, _, _, _ in found)
+        score = round(sum(sim * s for sim, s, _, _ in found) / weight)
+        if band and band[0] <= score <= band[1]:
+            return None
+        best_sim, _, best_link, best_model = found[0]
+        return {
+            "score": score,
+            "similarity": best_sim,
+            "link": best_link,
+            "model": best_model,
+            "neighbours": len(found),
+        }
+
+    def estimate(self, key: Tuple[str, str], text: str) -> Optional[float]:
+        """
+        Rough expected score from loosely similar past verdicts, for ordering work only
+        (never used as a verdict). None when nothing similar has been scored.
+        """
+        index = self.topics.get(key)
+        counts = term_counts(text)
+        if index is None or not index.entries or not counts:
+            return None
+        found = index.neighbours(counts, PRIORITY_MIN_SIMILARITY)
+        if not found:
+            return None
+        return sum(sim * score for sim, score, _, _ in found) / sum(sim for sim, _, _, _ in found)
+
+    def add(self, key: Tuple[str, str], text: str, score: int, link: str, model: Optional[str]) -> None:
+        counts = term_counts(text)
+        if counts:
+            self._topic(key).add(counts, score, link, model)
+
+
+def should_audit() -> bool:
+    return random.random() < REUSE_AUDIT_RATE
+
+
+def record_audit(predicted: int, actual: Optional[int]) -> None:
+    """Compare a reuse decision against the LLM's own score for the same item."""
+    if actual is None:
+        return
+    REUSE_STATS["audited"] += 1
+    if abs(predicted - actual) > REUSE_AUDIT_TOLERANCE:
+        REUSE_STATS["disagreements"] += 1
@@ -0,0 +1,92 @@
+"""
+Shared HTML-to-text cleanup for feed parsers.
+
+One regex pass removes dropped elements (iframes, commerce widgets, scripts) and all
+remaining tags, entities are decoded only when present, smart punctuation is replaced
+only for characters that occur, and whitespace is collapsed with split/join. With a
+max_chars limit the markup is walked lazily and cleaning stops as soon as enough
+text has been produced, so huge bodies are never cleaned in full.
+"""
+import html
+import re
+from typing import Iterable, Optional
+
+# ====== Configuration ======
+DESCRIPTION_MAX_CHARS = 4000   # description text kept per item (roughly 1k tokens)
+DROP_TAGS = ("iframe", "core-commerce", "script", "style", "noscript")
+CHUNK_CHARS = 8192             # raw text characters cleaned per batch when truncating
+
+_PUNCTUATION = (
+    ("\u2013", "-"), ("\u2014", "-"),
+    ("\u2018", "'"), ("\u2019", "'"),
+    ("\u201c", '"'), ("\u201d", '"'),
+    ("\xa0", " "),
+)
+
+
+def _markup_pattern(drop_tags: Iterable[str]) -> "re.Pattern":
+    """Dropped elements with their content, or any other tag."""
+    # One alternative per element: a backreference to the tag name is markedly slower
+    elements = "|".join(rf"{re.escape(t)}\b[^>]*>.*?</{re.escape(t)}\s*" for t in drop_tags)
+    return re.compile(rf"<(?:{elements}|[^>]*)>", flags=re.DOTALL | re.IGNORECASE)
+
+
+_MARKUP = _markup_pattern(DROP_TAGS)
+
+
+def normalize_text(text: str) -> str:
+    """Decode entities, map smart punctuation to ASCII and collapse whitespace."""
+    if not text:
+        return ""
+    if "&" in text:
+        text = html.unescape(text)
+    for char, replacement in _PUNCTUATION:
+        if char in text:
+            text = text.replace(char, replacement)
+    return " ".join(text.split())
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Cut at the last word boundary before max_chars."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars + 1)
+    return text[:cut if cut > 0 else max_chars].rstrip()
+
+
+def html_to_text(
+    raw_html: str,
+    max_chars: Optional[int] = None,
+    markup: "re.Pattern" = _MARKUP,
+) -> str:
+    """
+    Plain text of an HTML fragment: tags and dropped elements removed, entities decoded,
+    punctuation and whitespace normalized, at most max_chars characters.
+    Pass markup=_markup_pattern(...) to drop a different set of elements.
+    """
+    if not raw_html:
+        return ""
+    if "<" not in raw_html:
+        text = normalize_text(raw_html)
+        return _truncate(text, max_chars) if max_chars else text
+    if not max_chars or len(raw_html) <= CHUNK_CHARS:
+        text = normalize_text(markup.sub(" ", raw_html))
+        return _truncate(text, max_chars) if max_chars else text
+
+    # Streaming: walk the markup lazily and clean the text between it in batches
+    parts, batch, batch_chars, produced, pos = [], [], 0, 0, 0
+    for match in markup.finditer(raw_html):
+        batch.append(raw_html[pos:match.start()])
+        batch_chars += match.start() - pos
+        pos = match.end()
+        if batch_chars >= CHUNK_CHARS:
+            piece = normalize_text(" ".join(batch))
+            parts.append(piece)
+            produced += len(piece) + 1
+            batch, batch_chars = [], 0
+            if produced > max_chars:
+                break
+    else:
+        batch.append(raw_html[pos:])
+    parts.append(normalize_text(" ".join(batch)))
+    return _truncate(" ".join(p for p in parts if p), max_chars)
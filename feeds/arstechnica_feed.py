@@ -1,26 +1,16 @@
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
-import html
-import re
 
-def arstechnica_postprocess(raw_bytes):
+from core.feed_item import FeedItem
+from core.text_sanitizer import DESCRIPTION_MAX_CHARS, html_to_text, normalize_text
+
+def arstechnica_postprocess(raw_bytes, feed_name=""):
     """
     Parse and standardize an Ars Technica RSS feed.
     Input: raw XML bytes
-    Output: list of standardized dicts ready for model input.
+    Output: list of FeedItem ready for model input.
     """
 
-    def normalize_text(text: str) -> str:
-        """Decode HTML entities, fix punctuation, and normalize whitespace."""
-        text = html.unescape(text or "")
-        text = text.strip()
-        text = text.replace("\u2013", "-").replace("\u2014", "-")
-        text = text.replace("\u2018", "'").replace("\u2019", "'")
-        text = text.replace("\u201c", '"').replace("\u201d", '"')
-        text = text.replace("\xa0", " ")
-        text = re.sub(r"\s+", " ", text)
-        return text
-
     # --- Parse XML ---
     root = ET.fromstring(raw_bytes)
     items = []
@@ -29,7 +19,7 @@ def arstechnica_postprocess(raw_bytes):
     for node in root.findall(".//item"):
         title = normalize_text(node.findtext("title", ""))
         link = (node.findtext("link") or "").strip()
-        description = normalize_text(node.findtext("description", ""))
+        description = html_to_text(node.findtext("description", ""), DESCRIPTION_MAX_CHARS)
         pub_date_str = (node.findtext("pubDate") or "").strip()
 
         # --- Parse and normalize publication date ---
@@ -50,12 +40,12 @@ def arstechnica_postprocess(raw_bytes):
             else:
                 parsed = parsed.astimezone(timezone.utc)
 
-        items.append({
-            "title": title,
-            "link": link,
-            "description": description,
-            "pub_date": parsed,
-            "pub_date_str": pub_date_str,
-        })
+        items.append(FeedItem(
+            title=title,
+            link=link,
+            description=description,
+            pub_date=parsed,
+            feed=feed_name,
+        ))
 
     return items
@@ -1,41 +1,19 @@
 # feeds/engadget_feed.py
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
-import re
-import html
 import email.utils
 
+from core.feed_item import FeedItem
+from core.text_sanitizer import DESCRIPTION_MAX_CHARS, html_to_text, normalize_text
 
-def engadget_postprocess(raw_bytes):
+
+def engadget_postprocess(raw_bytes, feed_name=""):
     """
     Parse and standardize an Engadget RSS feed.
     Input: raw XML bytes
-    Output: list of standardized dicts with keys:
-        title, link, description, pub_date, pub_date_str, image
+    Output: list of FeedItem with title, link, description, pub_date, image
     """
 
-    def clean_html(raw_html: str) -> str:
-        """Strip tags and decode entities."""
-        if not raw_html:
-            return ""
-        cleaned = re.sub(r"<iframe[^>]*>.*?</iframe>", " ", raw_html, flags=re.DOTALL | re.IGNORECASE)
-        cleaned = re.sub(r"<core-commerce[^>]*>.*?</core-commerce>", " ", cleaned, flags=re.DOTALL | re.IGNORECASE)
-        cleaned = re.sub(r"<[^>]+>", " ", cleaned)  # remove any remaining tags
-        cleaned = html.unescape(cleaned)
-        cleaned = re.sub(r"\s+", " ", cleaned)
-        return cleaned.strip()
-
-    def normalize_text(text: str) -> str:
-        """Normalize smart punctuation and whitespace."""
-        text = html.unescape(text or "")
-        text = text.strip()
-        text = text.replace("\u2013", "-").replace("\u2014", "-")
-        text = text.replace("\u2018", "'").replace("\u2019", "'")
-        text = text.replace("\u201c", '"').replace("\u201d", '"')
-        text = text.replace("\xa0", " ")
-        text = re.sub(r"\s+", " ", text)
-        return text
-
     # --- Parse XML ---
     xml_str = raw_bytes.decode("utf-8", errors="ignore")
     root = ET.fromstring(xml_str)
@@ -45,7 +23,7 @@ def engadget_postprocess(raw_bytes):
     for node in root.findall(".//item"):
         title = normalize_text(node.findtext("title", ""))
         link = (node.findtext("link") or "").strip()
-        description = clean_html(node.findtext("description", ""))
+        description = html_to_text(node.findtext("description", ""), DESCRIPTION_MAX_CHARS)
         pub_date_str = (node.findtext("pubDate") or "").strip()
 
         # --- Parse publication date robustly ---
@@ -80,13 +58,13 @@ def engadget_postprocess(raw_bytes):
                 image_url = url.strip()
                 break
 
-        items.append({
-            "title": title,
-            "link": link,
-            "description": description,
-            "pub_date": pub_date,
-            "pub_date_str": pub_date_str,
-            "image": image_url,
-        })
+        items.append(FeedItem(
+            title=title,
+            link=link,
+            description=description,
+            pub_date=pub_date,
+            feed=feed_name,
+            image=image_url or None,
+        ))
 
     return items
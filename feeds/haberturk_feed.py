@@ -1,14 +1,18 @@
 import xml.etree.ElementTree as ET
-from html import unescape
 from datetime import datetime, timezone
 import email.utils
 
-def haberturk_postprocess(xml_bytes):
-    """Parse Haberturk RSS feed (manset, ekonomi, etc.) and normalize entries."""
+from core.feed_item import FeedItem
+from core.text_sanitizer import DESCRIPTION_MAX_CHARS, html_to_text, normalize_text
+
+def haberturk_postprocess(xml_bytes, feed_name=""):
+    """Parse Haberturk RSS feed (manset, ekonomi, etc.) and normalize entries into FeedItems."""
     xml_str = xml_bytes.decode("utf-8", errors="ignore")
     root = ET.fromstring(xml_str)
 
-    channel = root.find("channel") or root
+    channel = root.find("channel")
+    if channel is None:
+        channel = root
     entries = channel.findall("item")
     if not entries:
         # fallback: detect most frequent child tag
@@ -29,9 +33,9 @@ def haberturk_postprocess(xml_bytes):
                     return node.text.strip()
             return ""
 
-        title = unescape(get_text("title", "headline", "name"))
+        title = normalize_text(get_text("title", "headline", "name"))
         link = get_text("link", "url", "guid")
-        desc = unescape(get_text("description", "summary", "content", "subtitle"))
+        desc = html_to_text(get_text("description", "summary", "content", "subtitle"), DESCRIPTION_MAX_CHARS)
         pub_date_str = get_text("pubDate", "published", "updated", "date")
 
         # --- Parse pub_date robustly ---
@@ -66,13 +70,13 @@ def haberturk_postprocess(xml_bytes):
                 if img:
                     break
 
-        results.append({
-            "title": title,
-            "link": link,
-            "description": desc,
-            "pub_date_str": pub_date_str,
-            "pub_date": pub_date,
-            "image": img,
-        })
+        results.append(FeedItem(
+            title=title,
+            link=link,
+            description=desc,
+            pub_date=pub_date,
+            feed=feed_name,
+            image=img or None,
+        ))
 
     return results
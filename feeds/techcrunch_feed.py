@@ -1,20 +1,23 @@
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 
-def techcrunch_postprocess(raw_bytes):
+from core.feed_item import FeedItem
+from core.text_sanitizer import DESCRIPTION_MAX_CHARS, html_to_text, normalize_text
+
+def techcrunch_postprocess(raw_bytes, feed_name=""):
     """
     Parse and standardize the TechCrunch RSS feed.
     Input: raw XML bytes
-    Output: list of standardized dicts with title, link, description, pub_date, pub_date_str
+    Output: list of FeedItem with title, link, description, pub_date
     """
     root = ET.fromstring(raw_bytes)
     items = []
 
     # TechCrunch uses standard RSS 2.0 <item> elements
     for node in root.findall(".//item"):
-        title = (node.findtext("title") or "").strip()
+        title = normalize_text(node.findtext("title", ""))
         link = (node.findtext("link") or "").strip()
-        description = (node.findtext("description") or "").strip()
+        description = html_to_text(node.findtext("description", ""), DESCRIPTION_MAX_CHARS)
         pub_date_str = (node.findtext("pubDate") or "").strip()
 
         # Parse pub_date
@@ -34,12 +37,12 @@ def techcrunch_postprocess(raw_bytes):
             else:
                 parsed = parsed.astimezone(timezone.utc)
 
-        items.append({
-            "title": title,
-            "link": link,
-            "description": description,
-            "pub_date": parsed,
-            "pub_date_str": pub_date_str,
-        })
+        items.append(FeedItem(
+            title=title,
+            link=link,
+            description=description,
+            pub_date=parsed,
+            feed=feed_name,
+        ))
 
     return items
@@ -1,25 +1,16 @@
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
-import re
 
-def theverge_postprocess(raw_bytes):
+from core.feed_item import FeedItem
+from core.text_sanitizer import DESCRIPTION_MAX_CHARS, html_to_text, normalize_text
+
+def theverge_postprocess(raw_bytes, feed_name=""):
     """
     Parse and standardize The Verge Atom feed.
     Input: raw XML bytes
-    Output: list of standardized dicts with keys:
-        title, link, author, summary, pub_date, pub_date_str
+    Output: list of FeedItem with title, link, author, description (the summary), pub_date
     """
 
-    def normalize_text(text: str) -> str:
-        """Clean up smart quotes, unicode dashes, etc."""
-        text = (text or "").strip()
-        text = text.replace("\u2013", "-").replace("\u2014", "-")
-        text = text.replace("\u2018", "'").replace("\u2019", "'")
-        text = text.replace("\u201c", '"').replace("\u201d", '"')
-        text = text.replace("\xa0", " ")
-        text = re.sub(r"\s+", " ", text)
-        return text
-
     # Parse XML and detect Atom namespace if present
     root = ET.fromstring(raw_bytes)
     ns = {}
@@ -37,16 +28,21 @@ def theverge_postprocess(raw_bytes):
 
         # <link> in Atom may have attributes instead of text content
         link = ""
-        link_el = entry.find("a:link", ns) or entry.find("link")
+        # Elements without children are falsy, so compare with None rather than using `or`
+        link_el = entry.find("a:link", ns)
+        if link_el is None:
+            link_el = entry.find("link")
         if link_el is not None:
             link = link_el.attrib.get("href", "").strip()
 
-        author_el = entry.find("a:author/a:name", ns) or entry.find("author/name")
+        author_el = entry.find("a:author/a:name", ns)
+        if author_el is None:
+            author_el = entry.find("author/name")
         author = normalize_text(author_el.text if author_el is not None else "")
 
-        summary = normalize_text(entry.findtext("a:summary", default="", namespaces=ns))
+        summary = html_to_text(entry.findtext("a:summary", default="", namespaces=ns), DESCRIPTION_MAX_CHARS)
         if not summary:
-            summary = normalize_text(entry.findtext("summary", default=""))
+            summary = html_to_text(entry.findtext("summary", default=""), DESCRIPTION_MAX_CHARS)
 
         # Prefer <published>, fallback to <updated>
         pub_date_str = (
@@ -64,13 +60,13 @@ def theverge_postprocess(raw_bytes):
             except Exception:
                 parsed = None
 
-        items.append({
-            "title": title,
-            "link": link,
-            "author": author,
-            "description": summary,
-            "pub_date": parsed,
-            "pub_date_str": pub_date_str,
-        })
+        items.append(FeedItem(
+            title=title,
+            link=link,
+            description=summary,
+            pub_date=parsed,
+            feed=feed_name,
+            author=author or None,
+        ))
 
     return items
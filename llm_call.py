@@ -1,32 +1,556 @@
 import os
+import re
+import json
 import asyncio
 import time
 import random
-from typing import List, Dict, Union
-from openai import OpenAI, AsyncOpenAI
+from collections import deque
+from functools import lru_cache
+from typing import List, Dict, Union, Optional
+from openai import OpenAI, AsyncOpenAI, BadRequestError
 
 # NEW: instructor + pydantic for structured outputs
 import instructor
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
 
 # Retry constants
 MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 2  # seconds
 
+# Structured output mode: "lean" (native JSON schema + tolerant parser) or "instructor"
+STRUCTURED_MODE = os.getenv("LLM_STRUCTURED_MODE", "lean")
+DEFAULT_MAX_TOKENS = 1024
+LEAN_MAX_TOKENS = int(os.getenv("LLM_LEAN_MAX_TOKENS", 384))
+SCORE_ONLY_MAX_TOKENS = int(os.getenv("LLM_SCORE_ONLY_MAX_TOKENS", 64))
+# Reasoning models (gpt-5-*) spend hidden reasoning tokens out of max_tokens: lean calls ask
+# for minimal reasoning so the caps above go to the JSON ("" keeps the model's default)
+LEAN_REASONING_EFFORT = os.getenv("LLM_LEAN_REASONING_EFFORT", "minimal")
+
+# Per-call deadline and hedging: a call still running at the observed latency percentile
+# gets a duplicate request and the first answer wins, within a budget of extra calls
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 60))
+HEDGE_ENABLED = os.getenv("LLM_HEDGE", "1") == "1"
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", 0.95))
+HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", 0.05))  # hedges per completed call
+HEDGE_MIN_SAMPLES = 20       # latencies observed before hedging starts
+LATENCY_WINDOW = 500         # recent latencies kept per model
+
+# Prompt tokens of streams closed before the usage chunk are counted locally
+TOKENIZER_ENCODING = "o200k_base"
+TOKENS_PER_MESSAGE = 4       # chat framing around each message
+
+MODEL_NAME = "openai/gpt-5-mini"
+
+# Running totals for this process, see get_llm_stats()
+LLM_STATS: Dict[str, float] = {
+    "calls": 0,
+    "streamed": 0,
+    "early_exits": 0,
+    "reasks": 0,
+    "errors": 0,
+    "timeouts": 0,
+    "hedges": 0,
+    "hedge_wins": 0,
+    "truncated": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "latency_seconds": 0.0,
+}
+
 
 # NEW: Structured output model (exactly two fields)
 class Evaluation(BaseModel):
     score: int          # e.g., 1..10
     reasoning: str      # free-form explanation
+    confidence: Optional[int] = None  # 1..10, only requested by the model cascade
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a completion cannot be parsed into an Evaluation."""
+
+
+class TruncatedOutputError(StructuredOutputError):
+    """Raised when a completion stopped at max_tokens before its JSON was complete."""
+
+
+def evaluation_response_format(score_only: bool, with_confidence: bool = False) -> Dict:
+    """Native response_format payload for endpoints supporting JSON schema."""
+    properties: Dict = {"score": {"type": "integer"}}
+    if with_confidence:
+        properties["confidence"] = {"type": "integer"}
+    if not score_only:
+        properties["reasoning"] = {"type": "string"}
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "evaluation",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def evaluations_response_format(topics: List[str], with_confidence: bool = False) -> Dict:
+    """JSON schema payload for a fused call: {"evaluations": {topic: evaluation}}."""
+    evaluation = evaluation_response_format(False, with_confidence)["json_schema"]["schema"]
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "topic_evaluations",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "evaluations": {
+                        "type": "object",
+                        "properties": {topic: evaluation for topic in topics},
+                        "required": list(topics),
+                        "additionalProperties": False,
+                    },
+                },
+                "required": ["evaluations"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+@lru_cache(maxsize=32)
+def _topics_model(topics: tuple) -> type:
+    """Pydantic response model for instructor mode fused calls."""
+    evaluations = create_model("Evaluations", **{topic: (Evaluation, ...) for topic in topics})
+    return create_model("TopicEvaluations", evaluations=(evaluations, ...))
+
+
+_SCORE_RE = re.compile(r'"?score"?\s*[:=]\s*"?(-?\d+)', re.IGNORECASE)
+_CONFIDENCE_RE = re.compile(r'"?confidence"?\s*[:=]\s*"?(-?\d+)', re.IGNORECASE)
+_REASONING_RE = re.compile(r'"reasoning"\s*:\s*"((?:[^"\\]|\\.)*)', re.DOTALL)
+
+
+def parse_evaluation(text: Optional[str], score_only: bool = False) -> Evaluation:
+    """
+    Tolerant parser for score/reasoning completions.
+    Tries strict JSON first, then falls back to regex extraction so that code fences,
+    trailing prose or a truncated reasoning string do not cost a round trip.
+    A confidence field is picked up whenever present.
+    """
+    if not text:
+        raise StructuredOutputError("Empty completion.")
+    text = text.strip()
+
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            data = json.loads(text[start:end + 1])
+            if isinstance(data, dict) and "score" in data:
+                confidence = data.get("confidence")
+                return Evaluation(
+                    score=int(data["score"]),
+                    reasoning="" if score_only else str(data.get("reasoning") or ""),
+                    confidence=int(confidence) if confidence is not None else None,
+                )
+        except (ValueError, TypeError):
+            pass
+
+    score_match = _SCORE_RE.search(text)
+    if not score_match:
+        raise StructuredOutputError(f"No score found in completion: {text[:200]!r}")
+
+    reasoning = ""
+    if not score_only:
+        reason_match = _REASONING_RE.search(text)
+        if reason_match:
+            try:
+                reasoning = json.loads(f'"{reason_match.group(1)}"')
+            except ValueError:
+                reasoning = reason_match.group(1)
+    confidence_match = _CONFIDENCE_RE.search(text)
+    return Evaluation(
+        score=int(score_match.group(1)),
+        reasoning=reasoning,
+        confidence=int(confidence_match.group(1)) if confidence_match else None,
+    )
+
+
+def parse_evaluations(text: Optional[str], topics: List[str]) -> Dict[str, Evaluation]:
+    """
+    Tolerant parser for fused multi-topic completions. Reads {"evaluations": {...}}
+    (or the topics at top level), then falls back to locating each topic's object in
+    the raw text, so a truncated last entry still yields its score.
+    Raises StructuredOutputError if any topic is missing.
+    """
+    if not text:
+        raise StructuredOutputError("Empty completion.")
+    results: Dict[str, Evaluation] = {}
+
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            data = json.loads(text[start:end + 1])
+            evaluations = data.get("evaluations", data) if isinstance(data, dict) else {}
+            for topic in topics:
+                entry = evaluations.get(topic) if isinstance(evaluations, dict) else None
+                if isinstance(entry, dict) and "score" in entry:
+                    results[topic] = parse_evaluation(json.dumps(entry))
+        except (ValueError, TypeError):
+            pass
+
+    for topic in topics:
+        if topic in results:
+            continue
+        match = re.search(rf'"{re.escape(topic)}"\s*:\s*(\{{[^{{}}]*\}}?)', text)
+        if match:
+            try:
+                results[topic] = parse_evaluation(match.group(1))
+            except StructuredOutputError:
+                pass
+
+    missing = [topic for topic in topics if topic not in results]
+    if missing:
+        raise StructuredOutputError(f"No evaluation for topics {missing}: {text[:200]!r}")
+    return results
+
+
+# ====== Client ======
+
+_clients: Dict[tuple, AsyncOpenAI] = {}
+_schema_unsupported: set = set()  # base URLs that rejected json_schema response_format
+_reasoning_unsupported: set = set()  # (base URL, model) pairs that rejected reasoning_effort
+
+
+def _get_client(base_url: str, api_key: str) -> AsyncOpenAI:
+    """Reuse one AsyncOpenAI client (and its connection pool) per event loop."""
+    loop = asyncio.get_running_loop()
+    key = (id(loop), base_url, api_key)
+    client = _clients.get(key)
+    if client is None:
+        # Drop clients bound to previous event loops (e.g. warm Lambda invocations)
+        for stale in [k for k in _clients if k[0] != id(loop)]:
+            del _clients[stale]
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=LLM_TIMEOUT_SECONDS)
+        _clients[key] = client
+    return client
+
+
+def _response_format(
+    base_url: str, score_only: bool, with_confidence: bool, topics: Optional[List[str]] = None
+) -> Dict:
+    if base_url in _schema_unsupported:
+        return {"type": "json_object"}
+    if topics:
+        return evaluations_response_format(topics, with_confidence)
+    return evaluation_response_format(score_only, with_confidence)
+
+
+def _is_schema_rejection(e: BadRequestError) -> bool:
+    return "response_format" in str(e) or "json_schema" in str(e)
+
+
+async def _create_lean(client: AsyncOpenAI, base_url: str, params: Dict):
+    """
+    chat.completions.create for the lean path, dropping json_schema or reasoning_effort
+    (and remembering it for the endpoint) when the endpoint rejects them.
+    """
+    while True:
+        try:
+            return await client.chat.completions.create(**params)
+        except BadRequestError as e:
+            if "reasoning_effort" in params and "reasoning_effort" in str(e):
+                print(f"Endpoint rejected reasoning_effort for {params['model']}, sending without it: {e}")
+                _reasoning_unsupported.add((base_url, params["model"]))
+                params.pop("reasoning_effort")
+            elif _is_schema_rejection(e) and params["response_format"].get("type") != "json_object":
+                print(f"Endpoint rejected json_schema response_format, falling back to json_object: {e}")
+                _schema_unsupported.add(base_url)
+                params["response_format"] = {"type": "json_object"}
+            else:
+                raise
+
+
+def _parse_lean(text: Optional[str], truncated: bool, max_tokens: int, score_only: bool = False,
+                topics: Optional[List[str]] = None) -> Union[Evaluation, Dict[str, Evaluation]]:
+    """Parse a lean completion; a parse failure after hitting max_tokens is a TruncatedOutputError."""
+    try:
+        if topics:
+            return parse_evaluations(text, topics)
+        return parse_evaluation(text, score_only=score_only)
+    except StructuredOutputError as e:
+        if truncated:
+            raise TruncatedOutputError(f"Completion hit max_tokens={max_tokens}: {e}") from e
+        raise
+
+
+def _count_reask(*_args, **_kwargs) -> None:
+    LLM_STATS["reasks"] += 1
+
+
+@lru_cache(maxsize=1)
+def _tokenizer():
+    """tiktoken encoding, or None when tiktoken or its encoding file is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception as e:
+        print(f"⚠️ tiktoken unavailable, estimating prompt tokens from length: {e}")
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    encoding = _tokenizer()
+    return len(encoding.encode(text, disallowed_special=())) if encoding else len(text) // 4 + 1
+
+
+def estimate_prompt_tokens(messages: List[Dict[str, str]], response_format: Optional[Dict] = None) -> int:
+    """Local estimate of the prompt tokens a request is billed for (messages + schema)."""
+    total = 3  # the assistant reply is primed with a few tokens
+    for message in messages:
+        total += TOKENS_PER_MESSAGE + _count_tokens(message.get("content") or "")
+    if response_format:
+        total += _count_tokens(json.dumps(response_format))
+    return total
+
+
+def _record_usage(
+    usage,
+    started: float,
+    usage_out: Optional[Dict],
+    completion_tokens_estimate: int = 0,
+    prompt_tokens_estimate: int = 0,
+) -> None:
+    """Add latency and token usage of one completion to LLM_STATS (and usage_out)."""
+    latency = time.perf_counter() - started
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or prompt_tokens_estimate
+    completion_tokens = getattr(usage, "completion_tokens", 0) or completion_tokens_estimate
+
+    LLM_STATS["calls"] += 1
+    LLM_STATS["latency_seconds"] += latency
+    LLM_STATS["prompt_tokens"] += prompt_tokens
+    LLM_STATS["completion_tokens"] += completion_tokens
+
+    if usage_out is not None:
+        usage_out["latency_seconds"] = usage_out.get("latency_seconds", 0.0) + latency
+        usage_out["prompt_tokens"] = usage_out.get("prompt_tokens", 0) + prompt_tokens
+        usage_out["completion_tokens"] = usage_out.get("completion_tokens", 0) + completion_tokens
+
+
+def get_llm_stats() -> Dict[str, float]:
+    """Snapshot of LLM_STATS with the mean latency per call and p50/p95/p99 over all models."""
+    stats = dict(LLM_STATS)
+    stats["mean_latency_seconds"] = stats["latency_seconds"] / stats["calls"] if stats["calls"] else 0.0
+    stats.update(latency_percentiles())
+    return stats
+
+
+# ====== Latency tracking and hedging ======
+
+_latencies: Dict[str, deque] = {}
+
+
+def _observe_latency(model: str, seconds: float) -> None:
+    _latencies.setdefault(model, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+
+def _percentile(samples: List[float], p: float) -> float:
+    return samples[min(len(samples) - 1, int(p * len(samples)))] if samples else 0.0
+
+
+def latency_percentiles(model: Optional[str] = None) -> Dict[str, float]:
+    """p50/p95/p99 of recent call latencies (seconds) for one model, or all models."""
+    if model is not None:
+        samples = sorted(_latencies.get(model, ()))
+    else:
+        samples = sorted(x for window in _latencies.values() for x in window)
+    return {"p50": _percentile(samples, 0.50), "p95": _percentile(samples, 0.95), "p99": _percentile(samples, 0.99)}
+
+
+def _hedge_delay(model: str) -> Optional[float]:
+    """Seconds to wait before hedging a call to `model`, None if hedging is off or not warmed up."""
+    samples = _latencies.get(model)
+    if not HEDGE_ENABLED or not samples or len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return _percentile(sorted(samples), HEDGE_PERCENTILE)
+
+
+def _hedge_allowed() -> bool:
+    return LLM_STATS["hedges"] + 1 <= HEDGE_BUDGET * max(LLM_STATS["calls"], HEDGE_MIN_SAMPLES)
+
+
+async def _hedged(call, model: str):
+    """
+    Await call(); if it has not finished after the hedge delay and the budget allows,
+    start a duplicate and return whichever succeeds first, cancelling the other.
+    """
+    async def timed():
+        started = time.perf_counter()
+        result = await call()
+        _observe_latency(model, time.perf_counter() - started)
+        return result
+
+    first = asyncio.ensure_future(timed())
+    second = None
+    try:
+        delay = _hedge_delay(model)
+        if delay is None:
+            return await first
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done or not _hedge_allowed():
+            return await first
+
+        LLM_STATS["hedges"] += 1
+        second = asyncio.ensure_future(timed())
+        pending = {first, second}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        LLM_STATS["hedge_wins"] += 1
+                    return task.result()
+        return first.result()  # both failed: raise the original request's error
+    finally:
+        for task in (first, second):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+async def _lean_structured_call(
+    client: AsyncOpenAI,
+    base_url: str,
+    request_params: Dict,
+    score_only: bool,
+    with_confidence: bool,
+    usage_out: Optional[Dict],
+    topics: Optional[List[str]] = None,
+) -> Union[Evaluation, Dict[str, Evaluation]]:
+    """
+    Single structured completion without instructor: native JSON schema where the
+    endpoint supports it (json_object otherwise) and parse_evaluation on the text.
+    With topics, the fused response is parsed into {topic: Evaluation}.
+    """
+    params = dict(request_params)
+    params["response_format"] = _response_format(base_url, score_only, with_confidence, topics)
+
+    started = time.perf_counter()
+    response = await _create_lean(client, base_url, params)
+    _record_usage(response.usage, started, usage_out)
+
+    truncated = response.choices[0].finish_reason == "length"
+    if truncated:
+        LLM_STATS["truncated"] += 1
+    return _parse_lean(response.choices[0].message.content, truncated, params["max_tokens"], score_only, topics)
+
+
+# Complete "<field>": <digits> followed by a non-digit, so "1" is not mistaken for "10"
+_STREAM_SCORE_RE = re.compile(r'"score"\s*:\s*"?(-?\d+)\D')
+_STREAM_CONFIDENCE_RE = re.compile(r'"confidence"\s*:\s*"?(-?\d+)\D')
+
+
+async def _lean_streaming_call(
+    client: AsyncOpenAI,
+    base_url: str,
+    request_params: Dict,
+    early_exit_max_score: int,
+    with_confidence: bool,
+    usage_out: Optional[Dict],
+) -> Evaluation:
+    """
+    Streamed structured completion. The schema puts score first, so it is parsed from
+    the first few tokens; if it is <= early_exit_max_score the stream is closed and
+    Evaluation(score, "") is returned without waiting for the reasoning.
+    With confidence requested, the stream is only cut once confidence is known too.
+    """
+    params = dict(request_params)
+    params["response_format"] = _response_format(base_url, False, with_confidence)
+    params["stream"] = True
+    params["stream_options"] = {"include_usage": True}
+
+    started = time.perf_counter()
+    stream = await _create_lean(client, base_url, params)
+
+    LLM_STATS["streamed"] += 1
+    buffer = ""
+    chunks = 0
+    score: Optional[int] = None
+    confidence: Optional[int] = None
+    exited = False
+    truncated = False
+    usage = None
+    try:
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if chunk.choices and chunk.choices[0].finish_reason == "length":
+                truncated = True
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            chunks += 1
+            buffer += chunk.choices[0].delta.content
+
+            if score is None:
+                match = _STREAM_SCORE_RE.search(buffer)
+                if match:
+                    score = int(match.group(1))
+            if with_confidence and confidence is None:
+                match = _STREAM_CONFIDENCE_RE.search(buffer)
+                if match:
+                    confidence = int(match.group(1))
+
+            if (
+                score is not None
+                and score <= early_exit_max_score
+                and (confidence is not None or not with_confidence)
+            ):
+                LLM_STATS["early_exits"] += 1
+                exited = True
+                break
+    finally:
+        await stream.close()
+
+    # Cut short before the usage chunk: count the prompt locally, one content chunk is
+    # roughly one completion token
+    _record_usage(
+        usage, started, usage_out,
+        completion_tokens_estimate=chunks,
+        prompt_tokens_estimate=(
+            estimate_prompt_tokens(params["messages"], params["response_format"]) if usage is None else 0
+        ),
+    )
+
+    if exited:
+        return Evaluation(score=score, reasoning="", confidence=confidence)
+    if truncated:
+        LLM_STATS["truncated"] += 1
+    return _parse_lean(buffer, truncated, params["max_tokens"])
+
 
 async def chat_completion_async(
     chat_history: List[Dict[str, str]],
     temperature: float = 0.5,
     use_structured: bool = False,  # If True, return Evaluation(score:int, reasoning:str)
-) -> Union[str, "Evaluation"]:
+    score_only: bool = False,      # Structured only: skip reasoning, return Evaluation(score, "")
+    max_tokens: Optional[int] = None,
+    usage_out: Optional[Dict] = None,  # Filled with latency/token usage of this call
+    early_exit_max_score: Optional[int] = None,  # Lean only: stream, stop once score <= this
+    model: Optional[str] = None,   # Defaults to MODEL_NAME
+    with_confidence: bool = False,  # Structured only: also request a 1-10 confidence
+    topics: Optional[List[str]] = None,  # Structured only: fused call, returns {topic: Evaluation}
+) -> Union[str, "Evaluation", Dict[str, "Evaluation"]]:
     """
-    Async LLM chat completion helper using openai/gpt-5-mini with retries.
-    If use_structured=True, returns an Evaluation via instructor JSON schema enforcement.
+    Async LLM chat completion helper (MODEL_NAME unless model is given) with retries.
+    If use_structured=True, returns an Evaluation. STRUCTURED_MODE selects the lean path
+    (native JSON schema, tolerant parsing, tight token cap, minimal reasoning effort) or
+    instructor JSON mode. A lean completion cut off by its cap is re-asked with twice the cap.
+    With early_exit_max_score the lean path streams and cancels generation as soon as
+    the score is known to be at or below it (reasoning is then "").
+    Every attempt is bounded by LLM_TIMEOUT_SECONDS and may be hedged (see _hedged).
+    With topics, one completion scores every topic and a {topic: Evaluation} map is
+    returned; fused calls are never streamed and their token cap scales with the topics.
+    Parse failures that need another round trip are counted as re-asks in LLM_STATS.
     """
 
     base_url = os.getenv("LLM_BASE_URL")
@@ -36,51 +560,99 @@ async def chat_completion_async(
         raise AttributeError("LLM_BASE_URL environment variable not set.")
     if not api_key:
         raise AttributeError("LLM_API_KEY environment variable not set.")
+    base_url = base_url.rstrip('/')
 
-    # Create async OpenAI client
-    client: AsyncOpenAI | instructor.Client = AsyncOpenAI(
-        api_key=api_key,
-        base_url=base_url.rstrip('/'),
-    )
+    # Shared async OpenAI client
+    client: AsyncOpenAI | instructor.AsyncInstructor = _get_client(base_url, api_key)
+    lean = use_structured and STRUCTURED_MODE == "lean"
 
-    # If structured mode is requested, patch client for JSON schema enforcement
-    if use_structured:
+    # If instructor mode is requested, patch client for JSON schema enforcement
+    if use_structured and not lean:
         client = instructor.from_openai(client, mode=instructor.Mode.JSON)
+        client.on("parse:error", _count_reask)
+
+    model_name = model or MODEL_NAME
+    if usage_out is not None:
+        usage_out["model"] = model_name
 
-    model_name = "openai/gpt-5-mini"
+    if max_tokens is None:
+        if lean:
+            max_tokens = SCORE_ONLY_MAX_TOKENS if score_only else LEAN_MAX_TOKENS
+            max_tokens *= len(topics) if topics else 1
+        else:
+            max_tokens = DEFAULT_MAX_TOKENS
 
     request_params: Dict = {
         "model": model_name,
         "messages": chat_history.copy(),
         "temperature": temperature,
-        "max_tokens": 1024,
+        "max_tokens": max_tokens,
     }
+    if lean and LEAN_REASONING_EFFORT and (base_url, model_name) not in _reasoning_unsupported:
+        request_params["reasoning_effort"] = LEAN_REASONING_EFFORT
 
-    # In structured mode, instruct the client to parse into our Evaluation model
-    if use_structured:
-        request_params["response_model"] = Evaluation  # type: ignore[name-defined]
+    # In instructor mode, instruct the client to parse into our Evaluation model
+    if use_structured and not lean:
+        request_params["response_model"] = (
+            _topics_model(tuple(topics)) if topics else Evaluation  # type: ignore[name-defined]
+        )
 
     last_exception: Exception | None = None
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            # IMPORTANT: await the async create call
-            response = await client.chat.completions.create(**request_params)
-
+    async def call_once():
+        if lean and early_exit_max_score is not None and not score_only and not topics:
+            return await _lean_streaming_call(
+                client, base_url, request_params, early_exit_max_score,
+                with_confidence, usage_out,
+            )
+        if lean:
+            return await _lean_structured_call(
+                client, base_url, request_params, score_only, with_confidence, usage_out, topics
+            )
+
+        # IMPORTANT: await the async create call
+        started = time.perf_counter()
+        if use_structured:
+            response, completion = await client.chat.completions.create_with_completion(
+                **request_params
+            )
+            _record_usage(completion.usage, started, usage_out)
+            if topics:
+                return {topic: getattr(response.evaluations, topic) for topic in topics}
             # In structured mode, response is already an Evaluation instance
-            if use_structured:
-                return response  # type: ignore[return-value]
+            return response  # type: ignore[return-value]
 
-            # Non-structured: return raw text
-            return response.choices[0].message.content  # type: ignore[union-attr]
+        response = await client.chat.completions.create(**request_params)
+        _record_usage(response.usage, started, usage_out)
+
+        # Non-structured: return raw text
+        return response.choices[0].message.content  # type: ignore[union-attr]
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            # Hard per-call deadline, including any hedged duplicate
+            return await asyncio.wait_for(_hedged(call_once, model_name), timeout=LLM_TIMEOUT_SECONDS)
 
         except Exception as e:
             last_exception = e
             attempt_num = attempt + 1
+            if isinstance(e, TruncatedOutputError):
+                # Re-asking with the same cap would stop at the same place
+                LLM_STATS["reasks"] += 1
+                request_params["max_tokens"] *= 2
+            elif isinstance(e, StructuredOutputError):
+                LLM_STATS["reasks"] += 1
+            elif isinstance(e, asyncio.TimeoutError):
+                LLM_STATS["timeouts"] += 1
+                e = asyncio.TimeoutError(f"No response from {model_name} within {LLM_TIMEOUT_SECONDS:.0f}s")
+            else:
+                LLM_STATS["errors"] += 1
             print(f"Error during chat completion on attempt {attempt_num}/{MAX_RETRIES}: {e}")
 
             if attempt < MAX_RETRIES - 1:
-                # Exponential backoff with jitter
+                # Exponential backoff with jitter (a parse miss is re-asked immediately)
+                if isinstance(e, StructuredOutputError):
+                    continue
                 delay = (RETRY_DELAY_SECONDS * (2 ** attempt)) + random.uniform(0, 0.5)
                 print(f"Retrying in {delay:.2f} seconds...")
                 await asyncio.sleep(delay)
@@ -1,131 +1,31 @@
 import os
+import time
 import asyncio
-import aiohttp
-from datetime import datetime, timezone
+from typing import Optional
 from dotenv import load_dotenv
-import traceback  # Import traceback to get detailed error information
 
 from config.feeds_config import FEEDS
-from core.helpers import load_last_run_time, save_last_run_time, extract_score_reason
-from core.rss_fetcher import fetch_feed_content
-from core.relevance_analyzer import analyze_relevance_async
-from core.send_email import send_email
+from core.rss_fetcher import create_session, host_stats_summary
+from core.relevance_analyzer import CASCADE_STATS
+from core.archive import apply_retention
+from core.pipeline import run_pipeline
+from core.score_reuse import REUSE_STATS
+from core.alerts import ALERT_STATS
+from llm_call import get_llm_stats
 
 LLM_CONCURRENCY = 32
 
-async def process_feed(feed, session, sem, email_cfg):
+
+async def main(time_budget_seconds: Optional[float] = None):
     """
-    Process a single feed, sending an email on failure and always updating the timestamp.
+    One scheduled run. time_budget_seconds (Lambda's remaining time, or RUN_TIME_BUDGET_SECONDS)
+    bounds the run: work that does not fit is checkpointed for the next run.
     """
-    name = feed["name"]
-    start_time = datetime.now(timezone.utc)  # Consistent timestamp for this run
-
-    try:
-        urls = feed["urls"]
-        postprocess_fn = feed["postprocess_fn"]
-
-        print(f"\n📡 Processing feed: {name}")
-
-        last_run = load_last_run_time(name)
-        if last_run:
-            print(f"Last run for {name}: {last_run.strftime('%a, %d %b %Y %H:%M:%S GMT')}")
-        else:
-            print(f"First run for {name} (no previous timestamp found)")
-
-        # --- Fetch raw feed content ---
-        fetch_tasks = [fetch_feed_content(session, url) for url in urls]
-        results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-        # print(results)
-        # raise Exception("Debug Exception: Inspect fetched results")  # Debugging line
-
-        # --- Postprocess: parse and standardize feed content ---
-        processed_items = []
-        for res in results:
-            if isinstance(res, Exception):
-                print(f"❌ Fetch error in {name}: {res}")
-                continue
-            try:
-                items = postprocess_fn(res)  # feed-specific parser
-                processed_items.extend(items)
-            except Exception as e:
-                print(f"❌ Postprocessing error for {name}: {e}")
-
-        # --- Filter new items ---
-        new_items = [
-            it for it in processed_items
-            if it["pub_date"] is not None
-            and (last_run is None or it["pub_date"] > last_run)
-        ]
-        new_items.sort(key=lambda x: x["pub_date"], reverse=True)
-
-        if not new_items:
-            print(f"No new items in {name}.")
-            return
-
-        print(f"🆕 {len(new_items)} new items from {name}")
-
-        # --- Analyze relevance (feed-specific prompt) ---
-        base_prompt = feed.get("llm_prompt")
-
-        llm_tasks = [
-            analyze_relevance_async(it["description"], sem, base_prompt)
-            for it in new_items
-        ]
-        llm_results = await asyncio.gather(*llm_tasks, return_exceptions=True)
-
-        relevant_items_for_email = []
-        for item, result in zip(new_items, llm_results):
-            if isinstance(result, Exception):
-                print(f"Error analyzing {item['title']}: {result}")
-                continue
-
-            score, reason = extract_score_reason(result)
-            #print(score, reason)
-            if score and score > 5:
-                print(f"✅ Relevant: {item['title']} ({score})")
-                relevant_items_for_email.append((item, score, reason))
-
-        # --- Send email for relevant items ---
-        if relevant_items_for_email:
-            body_lines = [f"Found {len(relevant_items_for_email)} relevant articles in {name}:\n"]
-            for item, score, reason in relevant_items_for_email:
-                body_lines.append("---")
-                body_lines.append(f"Title: {item['title']}")
-                body_lines.append(f"Link: {item['link']}")
-                body_lines.append(f"Relevance Score: {score}")
-                body_lines.append(f"Reasoning: {reason}\n")
-
-            try:
-                send_email(
-                    subject=f"AI News Alert: {name}",
-                    body="\n".join(body_lines),
-                    **email_cfg,
-                )
-            except Exception as e:
-                print(f"❌ Email failed for {name}: {e}")
-
-    except Exception as e:
-        # If any part of the process fails, log it and send an email alert.
-        print(f"❌ CRITICAL ERROR processing feed '{name}': {e}")
-        error_details = traceback.format_exc()
-        print(error_details)
-        try:
-            send_email(
-                subject=f"CRITICAL ERROR in News Reporter: Failed to process '{name}'",
-                body=f"The news reporter failed to process the '{name}' feed.\n\nError:\n{error_details}",
-                **email_cfg,
-            )
-        except Exception as mail_e:
-            print(f"❌ Additionally, failed to send error email: {mail_e}")
-
-    finally:
-        # --- Always save the last run time to prevent reprocessing a failing feed ---
-        save_last_run_time(name, start_time)
-        print(f"✅ Updated last run time for {name} to {start_time.strftime('%a, %d %b %Y %H:%M:%S GMT')}\n")
-
-
-async def main():
+    started = time.monotonic()
     load_dotenv()
+    if time_budget_seconds is None and os.getenv("RUN_TIME_BUDGET_SECONDS"):
+        time_budget_seconds = float(os.getenv("RUN_TIME_BUDGET_SECONDS"))
+    deadline = started + time_budget_seconds if time_budget_seconds else None
 
     email_cfg = {
         "to_emails": [e.strip() for e in os.getenv("TO_EMAILS", "").split(",") if e.strip()],
@@ -137,9 +37,57 @@ async def main():
 
     sem = asyncio.Semaphore(LLM_CONCURRENCY)
 
-    async with aiohttp.ClientSession() as session:
-        for feed in FEEDS:
-            await process_feed(feed, session, sem, email_cfg)
+    # --- Fetch, parse, score and notify all feeds through the staged pipeline ---
+    async with create_session() as session:
+        written = await run_pipeline(
+            FEEDS, session, sem, email_cfg, score_workers=LLM_CONCURRENCY, deadline=deadline
+        )
+
+    # --- Apply the archive retention policy ---
+    try:
+        pruned = apply_retention()
+        print(f"🗄️ Archived {written} items ({pruned} expired items removed)")
+    except Exception as e:
+        print(f"❌ Archiving failed: {e}")
+
+    for host, host_stats in host_stats_summary().items():
+        print(
+            f"🌐 {host}: {host_stats['requests']} requests, {host_stats['failures']} failures, "
+            f"{host_stats['retries']} retries, p50 {host_stats['p50']:.2f}s, p95 {host_stats['p95']:.2f}s"
+        )
+
+    stats = get_llm_stats()
+    print(
+        f"📊 LLM: {stats['calls']} calls ({stats['early_exits']}/{stats['streamed']} streams cut early), "
+        f"{stats['reasks']} re-asks ({stats['truncated']} hit max_tokens), {stats['errors']} errors, "
+        f"{stats['prompt_tokens']}+{stats['completion_tokens']} tokens, "
+        f"{stats['mean_latency_seconds']:.2f}s mean latency"
+    )
+    print(
+        f"📊 LLM latency p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, p99 {stats['p99']:.2f}s; "
+        f"{stats['timeouts']} timeouts, {stats['hedges']} hedged ({stats['hedge_wins']} won by the hedge)"
+    )
+    for tier, tier_stats in CASCADE_STATS.items():
+        mean_latency = tier_stats["latency_seconds"] / tier_stats["calls"] if tier_stats["calls"] else 0.0
+        print(
+            f"📊 Tier {tier}: {tier_stats['calls']} calls, {tier_stats['final']} final verdicts, "
+            f"{mean_latency:.2f}s mean latency, ${tier_stats['cost_usd']:.4f}"
+        )
+    if ALERT_STATS["items"]:
+        mean_delay = ALERT_STATS["publish_to_send_seconds"] / ALERT_STATS["items"]
+        print(
+            f"📨 Alerts: {ALERT_STATS['items']} items in {ALERT_STATS['emails']} emails, "
+            f"publish to send {mean_delay:.0f}s mean, {ALERT_STATS['max_publish_to_send_seconds']:.0f}s max"
+        )
+    if REUSE_STATS["lookups"]:
+        reuse_rate = REUSE_STATS["reused"] / REUSE_STATS["lookups"]
+        disagreement = (
+            REUSE_STATS["disagreements"] / REUSE_STATS["audited"] if REUSE_STATS["audited"] else 0.0
+        )
+        print(
+            f"♻️ Score reuse: {REUSE_STATS['reused']}/{REUSE_STATS['lookups']} ({reuse_rate:.0%}), "
+            f"{REUSE_STATS['disagreements']}/{REUSE_STATS['audited']} audits disagreed ({disagreement:.0%})"
+        )
 
 
 # Use this for local use
@@ -148,4 +96,4 @@ if __name__ == "__main__":
 
 # # Use this (uncomment) for AWS Lambda
 # def lambda_handler(event, context):
-#     asyncio.run(main())
+#     asyncio.run(main(context.get_remaining_time_in_millis() / 1000))